@@ -0,0 +1,13 @@
+"""The actions one simulation step's input can hold.
+
+Held keys (LEFT, RIGHT) are in every step's input while they're down;
+presses (FIRE, SHOCK_WAVE, PLAY) appear only in the step that follows them.
+"""
+
+LEFT = 'left'
+RIGHT = 'right'
+FIRE = 'fire'
+SHOCK_WAVE = 'shock_wave'
+PLAY = 'play'
+
+ALL_ACTIONS = (LEFT, RIGHT, FIRE, SHOCK_WAVE, PLAY)
@@ -0,0 +1,52 @@
+import os
+
+import pygame
+
+
+class Assets:
+    """A class to load each game image once and share it between sprites."""
+
+    def __init__(self):
+        """Initialize the image cache and its load statistics."""
+        self.images = {}
+
+        # Load statistics, so we can confirm that a new fleet or a new set
+        # of lives doesn't touch the disk.
+        self.load_count = 0
+        self.bytes_read = 0
+        self.surface_bytes = 0
+        self.cache_hits = 0
+
+    def image(self, path):
+        """Return the shared Surface for path, loading it on first use."""
+        image = self.images.get(path)
+        if image is not None:
+            self.cache_hits += 1
+            return image
+
+        image = pygame.image.load(path)
+        self.load_count += 1
+        self.bytes_read += os.path.getsize(path)
+
+        # Convert the image to the display's pixel format once, so blitting
+        # it every frame doesn't have to convert it again. Images with
+        # per-pixel transparency (our PNGs) keep their alpha channel.
+        if pygame.display.get_surface() is not None:
+            if image.get_alpha() is not None or image.get_flags() & pygame.SRCALPHA:
+                image = image.convert_alpha()
+            else:
+                image = image.convert()
+
+        self.surface_bytes += image.get_bytesize() * image.get_width() * image.get_height()
+        self.images[path] = image
+        return image
+
+    def stats(self):
+        """Return a summary of what the cache has loaded so far."""
+        return {
+            'images': len(self.images),
+            'load_count': self.load_count,
+            'bytes_read': self.bytes_read,
+            'surface_bytes': self.surface_bytes,
+            'cache_hits': self.cache_hits,
+        }
@@ -0,0 +1,125 @@
+"""
+Pack every game image into one texture atlas.
+
+Run this file to bake the image files into images/atlas.png and its index,
+images/atlas.json. The game then opens one image file at startup instead of
+one per sprite type. Bake again after changing any of the images below.
+"""
+import json
+
+import pygame
+
+
+# The image files that go into the atlas, by name.
+IMAGE_FILES = {
+    'alien': 'images/alien.png',
+    'cat': 'images/cat.png',
+    'catface': 'images/catface.png',
+    'star': 'images/star.bmp',
+}
+
+ATLAS_IMAGE = 'images/atlas.png'
+ATLAS_INDEX = 'images/atlas.json'
+
+# (the width of the atlas, unless one image is wider)
+ATLAS_WIDTH = 512
+# Empty pixels kept between neighbouring images.
+PADDING = 1
+
+
+def pack(images):
+    """
+    Pack a dict of named images into one surface.
+
+    Images are placed tallest first on shelves that run across the atlas.
+    Return the atlas surface and a dict of each image's rect in it.
+    """
+    width = max([ATLAS_WIDTH] + [image.get_width() for image in images.values()])
+    rects = {}
+    x = y = shelf_height = 0
+    for name, image in sorted(images.items(),
+            key=lambda item: item[1].get_height(), reverse=True):
+        image_width, image_height = image.get_size()
+        if x + image_width > width:
+            # This shelf is full; start a new one under it.
+            x = 0
+            y += shelf_height + PADDING
+            shelf_height = 0
+        rects[name] = pygame.Rect(x, y, image_width, image_height)
+        x += image_width + PADDING
+        shelf_height = max(shelf_height, image_height)
+
+    surface = pygame.Surface((width, y + shelf_height), pygame.SRCALPHA)
+    surface.fill((0, 0, 0, 0))
+    surface.blits([(images[name], rect) for name, rect in rects.items()],
+        doreturn=False)
+    return surface, rects
+
+
+class Atlas:
+    """
+    A class to hold every game image in one display-format surface.
+
+    The image files come from the baked atlas if there is one, or from the
+    separate files otherwise. The bullet and shockwave images are made from
+    the settings. Sprites get their image as a subsurface of the atlas.
+    """
+
+    def __init__(self, ai_game):
+        """Load the images and pack them into the atlas."""
+        self.settings = ai_game.settings
+        self.assets = ai_game.assets
+
+        images = self._load_images()
+        images.update(self._make_projectile_images())
+        self.surface, rects = pack(images)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+
+        self.images = {name: self.surface.subsurface(rect)
+            for name, rect in rects.items()}
+
+    def _load_images(self):
+        """Return the image files' images, from the baked atlas if there is one."""
+        try:
+            with open(ATLAS_INDEX) as f:
+                index = json.load(f)
+        except OSError:
+            return {name: self.assets.image(path) for name, path in IMAGE_FILES.items()}
+
+        sheet = self.assets.image(ATLAS_IMAGE)
+        return {name: sheet.subsurface(rect) for name, rect in index.items()}
+
+    def _make_projectile_images(self):
+        """Return solid images the size and color of a bullet and a shockwave."""
+        settings = self.settings
+        images = {}
+        for name, size, color in (
+                ('bullet', (settings.bullet_width, settings.bullet_height),
+                    settings.bullet_color),
+                ('shock_wave', (settings.shock_wave_width, settings.shock_wave_height),
+                    settings.shock_wave_color)):
+            image = pygame.Surface(size, pygame.SRCALPHA)
+            image.fill(color)
+            images[name] = image
+        return images
+
+    def image(self, name):
+        """Return the image called name, as a subsurface of the atlas."""
+        return self.images[name]
+
+
+def bake():
+    """Pack the image files and save the atlas and its index."""
+    images = {name: pygame.image.load(path) for name, path in IMAGE_FILES.items()}
+    surface, rects = pack(images)
+    pygame.image.save(surface, ATLAS_IMAGE)
+    with open(ATLAS_INDEX, 'w') as f:
+        json.dump({name: list(rect) for name, rect in rects.items()}, f)
+        f.write('\n')
+    print("Wrote {} ({}x{}) and {}.".format(
+        ATLAS_IMAGE, surface.get_width(), surface.get_height(), ATLAS_INDEX))
+
+
+if __name__ == '__main__':
+    bake()
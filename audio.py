@@ -0,0 +1,117 @@
+"""
+The audio device, background music, and the numbers behind them.
+
+Run this file to compare the settings' audio profiles: the mixer latency
+and the memory the decoded sound effects take up under each one.
+"""
+import os
+import sys
+
+import pygame
+
+from settings import AUDIO_PROFILES, Settings
+from sound_bank import EFFECTS
+
+
+# Background music, best first. Compressed formats are streamed from disk,
+# so only the mixer's small buffer is held in memory.
+MUSIC_FILES = (
+    'sounds/VenusHotline.ogg',
+    'sounds/VenusHotline.wav',
+)
+
+
+class AudioEngine:
+    """A class to open the audio device in a chosen format and play the music."""
+
+    def __init__(self, ai_game):
+        """Choose the mixer format from the settings' audio profile."""
+        self.settings = ai_game.settings
+        profile = AUDIO_PROFILES[self.settings.audio_profile]
+        self.frequency = profile['frequency']
+        self.size = profile['size']
+        self.channels = profile['channels']
+        self.buffer = profile['buffer']
+        self.music_path = None
+
+        # Anything that starts the mixer from now on gets this format, too.
+        pygame.mixer.pre_init(self.frequency, self.size, self.channels, self.buffer)
+
+    def open(self):
+        """Open the audio device; pygame.error means there isn't a working one."""
+        pygame.mixer.init(self.frequency, self.size, self.channels, self.buffer)
+        # The device may not support the format asked for exactly.
+        self.frequency, self.size, self.channels = pygame.mixer.get_init()
+        # get_init() doesn't report the buffer, but pygame rounds it up to a
+        # power of two before opening the device.
+        self.buffer = 1 << (self.buffer - 1).bit_length()
+
+    def start_music(self):
+        """Stream the first music file found, on repeat; return True if there was one."""
+        if not pygame.mixer.get_init():
+            return False
+        for path in MUSIC_FILES:
+            if os.path.exists(path):
+                pygame.mixer.music.load(path)
+                # the loop of -1 means this song will repeate indefinitely
+                pygame.mixer.music.play(-1)
+                self.music_path = path
+                return True
+        print("No background music found (looked for {}).".format(', '.join(MUSIC_FILES)),
+            file=sys.stderr)
+        return False
+
+    @property
+    def latency_ms(self):
+        """Return how long a sound waits in the mixer's buffer, in ms, once it's open."""
+        return self.buffer / self.frequency * 1000
+
+    def sample_bytes(self, sound):
+        """Return the memory a decoded sound takes up in the mixer's format."""
+        # pygame decodes every Sound into the mixer's format when it loads it,
+        # so a smaller format means smaller effects, converted once.
+        frame_bytes = abs(self.size) // 8 * self.channels
+        return round(sound.get_length() * self.frequency) * frame_bytes
+
+    def stats(self, sounds):
+        """Return the mixer format, its latency and the memory sounds take up."""
+        return {
+            'frequency': self.frequency,
+            'size': self.size,
+            'channels': self.channels,
+            'buffer': self.buffer,
+            'latency_ms': self.latency_ms,
+            'effects_bytes': sum(self.sample_bytes(sound) for sound in sounds.values()),
+            'music': self.music_path,
+        }
+
+
+class _ProfileGame:
+    """The parts of a game that an AudioEngine needs, for comparing profiles."""
+
+    def __init__(self, profile):
+        self.settings = Settings()
+        self.settings.audio_profile = profile
+
+
+def main():
+    print("{:<12} {:>9} {:>5} {:>8} {:>7} {:>12} {:>11}".format(
+        'profile', 'frequency', 'bits', 'channels', 'buffer', 'latency ms', 'effects KB'))
+    for profile in AUDIO_PROFILES:
+        audio = AudioEngine(_ProfileGame(profile))
+        try:
+            audio.open()
+        except pygame.error:
+            # Without an audio device, the dummy driver still decodes sounds.
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+            audio.open()
+        sounds = {name: pygame.mixer.Sound(path) for name, (path, _, _) in EFFECTS.items()}
+        stats = audio.stats(sounds)
+        print("{:<12} {:>9} {:>5} {:>8} {:>7} {:>12.1f} {:>11.0f}".format(
+            profile, stats['frequency'], abs(stats['size']), stats['channels'],
+            stats['buffer'], stats['latency_ms'], stats['effects_bytes'] / 1024))
+        pygame.mixer.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""
+Play many headless games at once, for bot evaluation and balance sweeps.
+
+Every game gets its own seed and settings overrides, and is played by a
+simple bot policy in a pool of worker processes. Each game's result is
+written as one line of JSON as soon as it finishes. For example:
+
+    python3 batch.py --games 1000 --policy tracker --output results.jsonl
+    python3 batch.py --games 200 --sweep alien_points=40,50,60 \\
+        --set speedup_scale=1.2
+
+Each combination of --sweep values plays the same seeds, so results can be
+compared game by game. With --database, every finished game is also
+saved in a score database, which all the workers write to at once.
+"""
+import argparse
+import ast
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from actions import FIRE, LEFT, PLAY, RIGHT, SHOCK_WAVE
+from settings import STRESS_PROFILES, Settings
+
+
+def random_policy(ai_game, rng):
+    """Press random keys."""
+    actions = set()
+    roll = rng.random()
+    if roll < 0.4:
+        actions.add(LEFT)
+    elif roll < 0.8:
+        actions.add(RIGHT)
+    if rng.random() < 0.3:
+        actions.add(FIRE)
+    if rng.random() < 0.01:
+        actions.add(SHOCK_WAVE)
+    return actions
+
+
+def tracker_policy(ai_game, rng):
+    """Move under the lowest alien and keep firing."""
+    fleet = ai_game.fleet
+    actions = {FIRE}
+    if not fleet.alive.any():
+        return actions
+
+    # The lowest row is the most dangerous; go for its nearest alien.
+    cat_x = ai_game.cat.rect.centerx
+    alive_y = fleet.y[fleet.alive]
+    lowest = fleet.alive & (fleet.y == alive_y.max())
+    centers = fleet.x[lowest] + fleet.alien_width / 2
+    target = centers[abs(centers - cat_x).argmin()]
+    if target < cat_x - 10:
+        actions.add(LEFT)
+    elif target > cat_x + 10:
+        actions.add(RIGHT)
+    if rng.random() < 0.02:
+        actions.add(SHOCK_WAVE)
+    return actions
+
+
+POLICIES = {
+    'random': random_policy,
+    'tracker': tracker_policy,
+}
+
+
+def _init_worker():
+    """Set up a worker process to run games headless."""
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    # SDL turns SIGTERM into a quit event, which would keep the pool from
+    # shutting its workers down.
+    os.environ['SDL_NO_SIGNAL_HANDLERS'] = '1'
+
+
+def play_game(job):
+    """Play one headless game described by job; return its result."""
+    # Imported here, so only worker processes load pygame.
+    from cat_save_us import CatSaveUs
+
+    settings = Settings()
+    settings.apply_profile(job['profile'])
+    settings.override(job['overrides'])
+    if job['overrides']:
+        # As in the game, overridden settings are no named profile.
+        settings.profile = 'custom'
+    # Bot games only go in a database of their own, if one is given.
+    settings.score_database = job['database']
+    ai_game = CatSaveUs(headless=True, seed=job['seed'], settings=settings)
+
+    policy = POLICIES[job['policy']]
+    # The bot has its own random numbers, so it doesn't change the game's.
+    rng = random.Random(job['seed'])
+    render = job['render']
+    clock = time.perf_counter
+
+    start = clock()
+    ai_game.step(1, [{PLAY}], render)
+    while ai_game.stats.game_active and ai_game.sim_frames < job['max_frames']:
+        ai_game.step(1, [policy(ai_game, rng)], render)
+    seconds = clock() - start
+    # A game cut off at max_frames is still a run; one that ended was saved
+    # at game over. close() waits for the write.
+    if ai_game.stats.game_active:
+        ai_game._record_run()
+    ai_game.scores.close()
+
+    frames = ai_game.sim_frames
+    return {
+        'game': job['game'],
+        'seed': job['seed'],
+        'policy': job['policy'],
+        'profile': job['profile'],
+        'overrides': job['overrides'],
+        'score': ai_game.stats.score,
+        'level': ai_game.stats.level,
+        'frames': frames,
+        'game_over': not ai_game.stats.game_active,
+        'seconds': seconds,
+        'ms_per_frame': seconds / frames * 1000 if frames else 0.0,
+    }
+
+
+def make_jobs(games, seed, policy, profile, overrides, sweeps, max_frames, render,
+        database=None):
+    """Return a job for every game of every combination of sweep values."""
+    names = list(sweeps)
+    jobs = []
+    for values in itertools.product(*(sweeps[name] for name in names)):
+        combination = dict(overrides, **dict(zip(names, values)))
+        for game in range(games):
+            jobs.append({
+                'game': len(jobs),
+                'seed': seed + game,
+                'policy': policy,
+                'profile': profile,
+                'overrides': combination,
+                'max_frames': max_frames,
+                'render': render,
+                'database': database,
+            })
+    return jobs
+
+
+def run_batch(jobs, output, workers=None):
+    """Play jobs across a pool of workers, writing each result to output as it comes."""
+    with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        # Games take a while each, so they're handed out one at a time.
+        for result in pool.imap_unordered(play_game, jobs):
+            output.write(json.dumps(result) + '\n')
+            output.flush()
+            yield result
+
+
+def parse_setting(text):
+    """Return (name, value) from NAME=VALUE, with VALUE as a Python literal."""
+    name, _, value = text.partition('=')
+    try:
+        return name, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        # Anything that isn't a literal is taken as a string.
+        return name, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play many headless games of Cat Save Us!")
+    parser.add_argument('--games', type=int, default=100,
+        help="games per combination of settings (default: 100)")
+    parser.add_argument('--seed', type=int, default=0,
+        help="seed of the first game; the others count up from it (default: 0)")
+    parser.add_argument('--policy', choices=list(POLICIES), default='tracker',
+        help="the bot that plays (default: tracker)")
+    parser.add_argument('--profile', choices=list(STRESS_PROFILES), default='default',
+        help="stress profile to start from (default: default)")
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=VALUE',
+        help="override a setting in every game")
+    parser.add_argument('--sweep', action='append', default=[], metavar='NAME=V1,V2,...',
+        help="play every game once with each value of a setting")
+    parser.add_argument('--max-frames', type=int, default=60 * 60 * 10,
+        help="end a game after this many simulation steps (default: ten minutes)")
+    parser.add_argument('--render', action='store_true', help="draw every frame too")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per core)")
+    parser.add_argument('--database', metavar='PATH',
+        help="also save every finished game in this score database")
+    parser.add_argument('--output', default='batch_results.jsonl', metavar='PATH',
+        help="JSON lines file for the results (default: batch_results.jsonl)")
+    args = parser.parse_args()
+
+    overrides = dict(parse_setting(text) for text in args.set)
+    sweeps = {}
+    for text in args.sweep:
+        name, _, values = text.partition('=')
+        sweeps[name] = [parse_setting('=' + value)[1] for value in values.split(',')]
+    # Catch misspelled settings before starting any workers.
+    try:
+        Settings().override(dict(overrides, **{name: values[0]
+            for name, values in sweeps.items()}))
+    except ValueError as e:
+        parser.error(str(e))
+
+    jobs = make_jobs(args.games, args.seed, args.policy, args.profile, overrides,
+        sweeps, args.max_frames, args.render, args.database)
+    start = time.perf_counter()
+    frames = 0
+    scores = {}
+    with open(args.output, 'w') as output:
+        for done, result in enumerate(run_batch(jobs, output, args.workers), 1):
+            frames += result['frames']
+            key = json.dumps(result['overrides'], sort_keys=True)
+            scores.setdefault(key, []).append(result['score'])
+            print("\r{}/{} games".format(done, len(jobs)), end='', file=sys.stderr)
+    seconds = time.perf_counter() - start
+    print(file=sys.stderr)
+
+    print("{} games, {} frames in {:.1f} s ({:.0f} frames/s)".format(
+        len(jobs), frames, seconds, frames / seconds if seconds else 0.0))
+    for key, key_scores in scores.items():
+        print("{:<40} mean score {:>10.0f}".format(
+            key, sum(key_scores) / len(key_scores)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Microbenchmark: FleetGrid versus pygame.sprite.groupcollide().
+
+Run from the repository root:
+
+    python -m benchmarks.bench_collision
+"""
+import random
+import timeit
+
+import pygame
+
+from bullet import Bullet
+from cat_save_us import CatSaveUs
+from settings import Settings
+
+
+def make_game(scale):
+    """Return a headless game on a screen scale times the usual size."""
+    settings = Settings()
+    # A bigger screen fits a bigger fleet.
+    settings.screen_width *= scale
+    settings.screen_height *= scale
+    # Benchmarks want the whole fleet in place from the start.
+    settings.fleet_spawn_interval = 0
+    return CatSaveUs(headless=True, seed=0, settings=settings)
+
+
+def make_bullets(ai_game, count, rng):
+    """Return a group of count bullets scattered over the screen."""
+    bullets = pygame.sprite.Group()
+    for _ in range(count):
+        bullet = Bullet(ai_game)
+        bullet.rect.x = rng.randrange(ai_game.settings.screen_width)
+        bullet.rect.y = rng.randrange(ai_game.settings.screen_height)
+        bullets.add(bullet)
+    return bullets
+
+
+def main():
+    print("{:>8} {:>8} {:>16} {:>16} {:>8}".format(
+        'aliens', 'bullets', 'groupcollide us', 'FleetGrid us', 'speedup'))
+    for scale in (1, 2, 4):
+        bench_fleet(scale)
+
+
+def bench_fleet(scale):
+    """Time both collision checks against the fleet of a screen scale times bigger."""
+    ai_game = make_game(scale)
+    fleet = ai_game.fleet
+    grid = ai_game.fleet_grid
+    rng = random.Random(1)
+
+    for count in (1, 20, 100, 500):
+        bullets = make_bullets(ai_game, count, rng)
+
+        # Both must find the same hits before their speed is worth comparing.
+        expected = pygame.sprite.groupcollide(bullets, fleet.aliens, False, False)
+        assert grid.groupcollide(bullets, False, False) == expected
+
+        number = max(10, 2000 // count)
+        pygame_time = min(timeit.repeat(
+            lambda: pygame.sprite.groupcollide(bullets, fleet.aliens, False, False),
+            number=number, repeat=5)) / number
+        grid_time = min(timeit.repeat(
+            lambda: grid.groupcollide(bullets, False, False),
+            number=number, repeat=5)) / number
+        print("{:>8} {:>8} {:>16.1f} {:>16.1f} {:>7.1f}x".format(
+            len(fleet.aliens), count, pygame_time * 1e6, grid_time * 1e6, pygame_time / grid_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+"""
+Benchmark suite for the game loop and its subsystems.
+
+Every benchmark runs on a headless game and times one piece of work many
+times over. Run from the repository root:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --baseline results.json
+
+With --baseline, each result is compared with the saved one, and the run
+fails if any mean time got slower by more than --threshold.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+from actions import FIRE, LEFT, PLAY, RIGHT
+from benchmarks.bench_collision import make_bullets, make_game
+from renderer import DirtyRenderer
+
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register the decorated function as the benchmark called name."""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def time_calls(func, samples):
+    """Call func samples times; return how long each call took, in seconds."""
+    times = []
+    clock = time.perf_counter
+    for _ in range(samples):
+        start = clock()
+        func()
+        times.append(clock() - start)
+    return times
+
+
+def percentile(sorted_times, fraction):
+    """Return the nearest-rank percentile of a sorted list."""
+    index = min(len(sorted_times) - 1, int(fraction * len(sorted_times)))
+    return sorted_times[index]
+
+
+def summarize(times):
+    """Return the fps and percentile times (in ms) of a list of timings."""
+    sorted_times = sorted(times)
+    mean = sum(times) / len(times)
+    return {
+        'samples': len(times),
+        'fps': 1 / mean if mean else 0.0,
+        'mean_ms': mean * 1000,
+        'p50_ms': percentile(sorted_times, 0.50) * 1000,
+        'p95_ms': percentile(sorted_times, 0.95) * 1000,
+        'p99_ms': percentile(sorted_times, 0.99) * 1000,
+        'max_ms': sorted_times[-1] * 1000,
+    }
+
+
+def playing_game(scale=1, bullets=0):
+    """Return a started headless game with bullets already in flight."""
+    ai_game = make_game(scale)
+    ai_game.step(1, [{PLAY}])
+    for _ in range(bullets):
+        ai_game.bullets.fire()
+    return ai_game
+
+
+@benchmark('fleet_creation')
+def bench_fleet_creation(samples):
+    """Build a new fleet, as at every level change and cat hit."""
+    results = {}
+    for scale in (1, 3):
+        ai_game = playing_game(scale)
+        # All at once, and the first row only (the rest enter over later frames).
+        for interval, key in ((0, 'all_rows'), (0.05, 'first_row')):
+            ai_game.settings.fleet_spawn_interval = interval
+            results['scale={} {}'.format(scale, key)] = time_calls(
+                ai_game._create_fleet, samples)
+    return results
+
+
+@benchmark('update_bullets')
+def bench_update_bullets(samples):
+    """Move bullets and check them against the fleet, at several bullet counts."""
+    results = {}
+    for count in (1, 20):
+        ai_game = playing_game()
+
+        def update():
+            # Keep count bullets in flight, so every sample moves the same number.
+            while len(ai_game.bullets) < count and ai_game.bullets.fire():
+                pass
+            ai_game._update_bullets(ai_game.sim_dt)
+        results['bullets={}'.format(count)] = time_calls(update, samples)
+    return results
+
+
+@benchmark('update_aliens')
+def bench_update_aliens(samples):
+    """Move the fleet and check it against the cat and the bottom of the screen."""
+    results = {}
+    for scale in (1, 2):
+        ai_game = playing_game(scale)
+
+        def update():
+            ai_game._update_aliens(ai_game.sim_dt)
+            if len(ai_game.aliens) < len(ai_game.fleet.sprites) // 2:
+                ai_game._create_fleet()
+        results['aliens={}'.format(len(ai_game.aliens))] = time_calls(update, samples)
+    return results
+
+
+@benchmark('collisions')
+def bench_collisions(samples):
+    """Check scattered bullets against fleets of several sizes."""
+    results = {}
+    rng = random.Random(1)
+    for scale in (1, 2, 4):
+        ai_game = make_game(scale)
+        for count in (1, 20, 100):
+            bullets = make_bullets(ai_game, count, rng)
+            key = 'aliens={} bullets={}'.format(len(ai_game.aliens), count)
+            results[key] = time_calls(
+                lambda: ai_game.fleet_grid.groupcollide(bullets, False, False), samples)
+    return results
+
+
+@benchmark('hud_render')
+def bench_hud_render(samples):
+    """Render and draw the scoreboard with a new score every sample."""
+    ai_game = playing_game()
+    rng = random.Random(1)
+
+    def render():
+        ai_game.stats.score = rng.randrange(10 ** 6)
+        ai_game.sb.prep_score()
+        ai_game.sb.prep_level()
+        ai_game.sb.show_score(ai_game.renderer.batch)
+        ai_game.renderer.batch.flush()
+    return {'': time_calls(render, samples)}
+
+
+@benchmark('full_frame')
+def bench_full_frame(samples):
+    """Draw a complete frame of a game in progress."""
+    results = {}
+    for dirty in (False, True):
+        ai_game = playing_game(bullets=10)
+        if dirty:
+            ai_game.renderer = DirtyRenderer(ai_game)
+            ai_game.renderer.set_background(ai_game.starfield.background)
+        key = 'dirty_rects' if dirty else 'full'
+        results[key] = time_calls(ai_game._update_screen, samples)
+    return results
+
+
+@benchmark('game_step')
+def bench_game_step(samples):
+    """Run whole simulation steps, with the cat moving and firing."""
+    ai_game = playing_game()
+    inputs = [{LEFT, FIRE}, {LEFT}, {RIGHT, FIRE}, {RIGHT}]
+    step_number = [0]
+
+    def step():
+        ai_game.step(1, [inputs[step_number[0] // 30 % 4]])
+        step_number[0] += 1
+        if not ai_game.stats.game_active:
+            ai_game.step(1, [{PLAY}])
+    return {'': time_calls(step, samples)}
+
+
+def run(names, samples):
+    """Run the named benchmarks; return {result name: summary}."""
+    results = {}
+    for name in names:
+        for variant, times in BENCHMARKS[name](samples).items():
+            key = '{} {}'.format(name, variant) if variant else name
+            results[key] = summarize(times)
+    return results
+
+
+def print_results(results, baseline=None):
+    """Print a table of results, with the change against baseline if given."""
+    print("{:<38} {:>10} {:>9} {:>9} {:>9} {:>9}  {}".format(
+        'benchmark', 'fps', 'mean ms', 'p50 ms', 'p95 ms', 'p99 ms',
+        'vs baseline' if baseline else ''))
+    for key, result in results.items():
+        change = ''
+        if baseline and key in baseline:
+            change = "{:+.1%}".format(result['mean_ms'] / baseline[key]['mean_ms'] - 1)
+        print("{:<38} {:>10.0f} {:>9.4f} {:>9.4f} {:>9.4f} {:>9.4f}  {}".format(
+            key, result['fps'], result['mean_ms'], result['p50_ms'],
+            result['p95_ms'], result['p99_ms'], change))
+
+
+def regressions(results, baseline, threshold):
+    """Return the names of results whose mean got slower than threshold allows."""
+    return [key for key, result in results.items()
+        if key in baseline
+        and result['mean_ms'] > baseline[key]['mean_ms'] * (1 + threshold)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cat Save Us! benchmarks")
+    parser.add_argument('names', nargs='*', metavar='name',
+        help="benchmarks to run: {} (default: all)".format(', '.join(BENCHMARKS)))
+    parser.add_argument('--samples', type=int, default=500,
+        help="timings per benchmark (default: 500)")
+    parser.add_argument('--output', metavar='PATH', help="save the results as JSON")
+    parser.add_argument('--baseline', metavar='PATH', help="compare with saved results")
+    parser.add_argument('--threshold', type=float, default=0.10,
+        help="slowdown of the mean that counts as a regression (default: 0.10)")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error("unknown benchmarks: {}".format(', '.join(unknown)))
+
+    results = run(args.names or list(BENCHMARKS), args.samples)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'samples': args.samples, 'results': results}, f, indent=2)
+
+    if baseline:
+        slower = regressions(results, baseline, args.threshold)
+        if slower:
+            sys.exit("Slower than the baseline: {}".format(', '.join(slower)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Stress test: how frame time grows with the number of entities on screen.
+
+Each stress profile (see settings.STRESS_PROFILES) is played headless by
+a cat that sweeps from side to side while auto-fire empties its bullets
+into the fleet. Every step is simulated and drawn, and the mean entity
+count is reported next to the frame times. Run from the repository root:
+
+    python -m benchmarks.stress
+    python -m benchmarks.stress large extreme --steps 600 --output stress.json
+"""
+import argparse
+import json
+import time
+
+from actions import LEFT, PLAY, RIGHT, SHOCK_WAVE
+from benchmarks.run import summarize
+from cat_save_us import CatSaveUs
+from settings import STRESS_PROFILES, Settings
+
+
+def stress(profile, steps):
+    """Play steps frames of the stress profile; return its entity counts and frame times."""
+    settings = Settings()
+    settings.apply_profile(profile)
+    ai_game = CatSaveUs(headless=True, seed=0, settings=settings)
+    ai_game.step(1, [{PLAY}])
+
+    # Sweep across the screen in about two seconds each way.
+    sweep = 2 * settings.sim_rate
+    times = []
+    entities = []
+    clock = time.perf_counter
+    for step in range(steps):
+        actions = {LEFT if step // sweep % 2 else RIGHT, SHOCK_WAVE}
+        if not ai_game.stats.game_active:
+            actions = {PLAY}
+        start = clock()
+        ai_game.step(1, [actions], render=True)
+        times.append(clock() - start)
+        entities.append(len(ai_game.aliens) + len(ai_game.bullets)
+            + len(ai_game.shock_waves))
+
+    result = summarize(times)
+    result.update(
+        screen='{}x{}'.format(settings.screen_width, settings.screen_height),
+        fleet=len(ai_game.fleet.sprites),
+        mean_entities=sum(entities) / len(entities),
+        max_entities=max(entities),
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cat Save Us! stress test")
+    parser.add_argument('profiles', nargs='*', metavar='profile',
+        help="profiles to run: {} (default: all)".format(', '.join(STRESS_PROFILES)))
+    parser.add_argument('--steps', type=int, default=1200,
+        help="frames to play per profile (default: 1200)")
+    parser.add_argument('--output', metavar='PATH', help="save the results as JSON")
+    args = parser.parse_args()
+    unknown = [name for name in args.profiles if name not in STRESS_PROFILES]
+    if unknown:
+        parser.error("unknown profiles: {}".format(', '.join(unknown)))
+
+    print("{:<10} {:>10} {:>6} {:>10} {:>8} {:>9} {:>9} {:>8}".format(
+        'profile', 'screen', 'fleet', 'entities', 'max', 'mean ms', 'p95 ms', 'fps'))
+    results = {}
+    for profile in args.profiles or list(STRESS_PROFILES):
+        result = results[profile] = stress(profile, args.steps)
+        print("{:<10} {:>10} {:>6} {:>10.0f} {:>8} {:>9.3f} {:>9.3f} {:>8.0f}".format(
+            profile, result['screen'], result['fleet'], result['mean_entities'],
+            result['max_entities'], result['mean_ms'], result['p95_ms'], result['fps']))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'steps': args.steps, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
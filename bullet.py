@@ -1,5 +1,5 @@
 import pygame
-from pygame.sprite import Sprite
+from pygame.sprite import Group, Sprite
 
 
 class Bullet(Sprite):
@@ -10,27 +10,30 @@ class Bullet(Sprite):
         super().__init__()
         self.screen = ai_game.screen
         self.settings = ai_game.settings
-        self.color = self.settings.bullet_color
+        # (a solid image of the bullet, from the atlas)
+        self.image = ai_game.atlas.image('bullet')
+
+        self.cat = ai_game.cat
 
         # Create a bullet rect at (0, 0) and then set correct position.
         self.rect = pygame.Rect(0, 0, self.settings.bullet_width,
             self.settings.bullet_height)
-        self.rect.midtop = ai_game.cat.rect.midtop
+        self.reset()
+
+    def reset(self):
+        """Move the bullet back to the cat's current position."""
+        self.rect.midtop = self.cat.rect.midtop
 
         # Store the bullet's position as a decimal value.
         self.y = float(self.rect.y)
 
-    def update(self):
+    def update(self, dt):
         """Move the bullet up the screen."""
         # Update the decimal position of the bullet.
-        self.y -= self.settings.bullet_speed
+        self.y -= self.settings.bullet_speed * dt
         # Update the rect position.
         self.rect.y = self.y
 
-    def draw_bullet(self):
-        """Draw the bullet to the screen."""
-        pygame.draw.rect(self.screen, self.color, self.rect)
-
 
 class ShockWave(Sprite):
     """A class to manage shockwaves fired from the cat."""
@@ -40,23 +43,66 @@ class ShockWave(Sprite):
         super().__init__()
         self.screen = ai_game.screen
         self.settings = ai_game.settings
-        self.color = self.settings.shock_wave_color
+        # (a solid image of the shockwave, from the atlas)
+        self.image = ai_game.atlas.image('shock_wave')
+
+        self.cat = ai_game.cat
 
         # Create a bullet rect at (0, 0) and then set correct position.
         self.rect = pygame.Rect(0, 0, self.settings.shock_wave_width,
             self.settings.shock_wave_height)
-        self.rect.midtop = ai_game.cat.rect.midtop
+        self.reset()
+
+    def reset(self):
+        """Move the shockwave back to the cat's current position."""
+        self.rect.midtop = self.cat.rect.midtop
 
         # Store the bullet's position as a decimal value.
         self.y = float(self.rect.y)
 
-    def update(self):
+    def update(self, dt):
         """Move the shockwave up the screen."""
         # Update the decimal position of the bullet.
-        self.y -= self.settings.shock_wave_speed
+        self.y -= self.settings.shock_wave_speed * dt
         # Update the rect position.
         self.rect.y = self.y
 
-    def draw_shock_wave(self):
-        """Draw the shockwave to the screen."""
-        pygame.draw.rect(self.screen, self.color, self.rect)
+
+class ProjectilePool(Group):
+    """
+    A sprite group that reuses a fixed set of projectiles.
+
+    Every projectile the group can hold is created up front. Firing takes a
+    free one and moves it to the cat; removing one from the group (culling,
+    kill() or empty()) puts it back on the free list.
+    """
+
+    def __init__(self, ai_game, projectile_class, capacity):
+        """Create capacity projectiles of projectile_class, all free."""
+        super().__init__()
+        self.free = [projectile_class(ai_game) for _ in range(capacity)]
+
+    def fire(self):
+        """Activate a free projectile at the cat; return it, or None if none are free."""
+        if not self.free:
+            return None
+        projectile = self.free.pop()
+        projectile.reset()
+        self.add(projectile)
+        return projectile
+
+    def remove_internal(self, sprite):
+        """Remove sprite from the group, and free it for reuse."""
+        super().remove_internal(sprite)
+        self.free.append(sprite)
+
+    def cull(self):
+        """Free the projectiles that have disappeared off the top of the screen."""
+        # Look before building anything, since most frames have nothing to cull.
+        for projectile in self.spritedict:
+            if projectile.rect.bottom <= 0:
+                break
+        else:
+            return
+        self.remove([projectile for projectile in self.spritedict
+            if projectile.rect.bottom <= 0])
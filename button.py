@@ -12,7 +12,8 @@ class Button:
         self.width, self.height = 450, 60
         self.button_color = (104, 130, 158)
         self.text_color = (0, 200, 100)
-        self.font = pygame.font.SysFont(None, 48)
+        self.fonts = ai_game.fonts
+        self.font_key = (None, 48, False)
 
         # Build the button's rect object and center it.
         self.rect = pygame.Rect(0, 0, self.width, self.height)
@@ -23,7 +24,8 @@ class Button:
 
     def _prep_msg(self, msg):
         """Turn msg into a rendered image and center text on the button."""
-        self.msg_image = self.font.render(msg, True, self.text_color, self.button_color)
+        self.msg_image = self.fonts.render(msg, self.font_key, self.text_color,
+            self.button_color)
         self.msg_image_rect = self.msg_image.get_rect()
         self.msg_image_rect.center = self.rect.center
 
@@ -31,3 +33,5 @@ class Button:
         # Draw a blank button and then draw the message.
         self.screen.fill(self.button_color, self.rect)
         self.screen.blit(self.msg_image, self.msg_image_rect)
+        # The message sits inside the button, so the button's rect covers both.
+        return [self.rect.clip(self.screen_rect)]
@@ -1,4 +1,3 @@
-import pygame
 from pygame.sprite import Sprite
 
 class Cat(Sprite):
@@ -12,8 +11,8 @@ class Cat(Sprite):
         self.screen_rect = ai_game.screen.get_rect()
         # In Pygame, "rect" = rectangles.
 
-        # Load the cat image and get its rect.
-        self.image = pygame.image.load('images/cat.png')
+        # Get the cat image from the atlas and its rect.
+        self.image = ai_game.atlas.image('cat')
         self.rect = self.image.get_rect()
 
         # Start each new cat at the bottom center of the screen.
@@ -30,22 +29,17 @@ class Cat(Sprite):
         self.moving_right = False
         self.moving_left = False
 
-    def update(self):
+    def update(self, dt):
         """Update the cat's position based on the movement flags."""
         # Update the cat's x value, not the rect.
         if self.moving_right and self.rect.right < self.screen_rect.right:
-            self.x += self.settings.cat_speed
+            self.x += self.settings.cat_speed * dt
         if self.moving_left and self.rect.left > 0:
-            self.x -= self.settings.cat_speed
+            self.x -= self.settings.cat_speed * dt
 
         # Update rect object from self.x.
         self.rect.x = self.x
 
-    def blitme(self):
-        """Draw the cat at its current location."""
-        self.screen.blit(self.image, self.rect)
-        # The position is specified by self.rect.
-
     def center_cat(self):
         """Center the cat on the screen."""
         self.rect.midbottom = self.screen_rect.midbottom
@@ -61,5 +55,5 @@ class CatFace(Sprite):
         self.screen = ai_game.screen
         self.settings = ai_game.settings
         self.screen_rect = ai_game.screen.get_rect()
-        self.image = pygame.image.load('images/catface.png')
+        self.image = ai_game.atlas.image('catface')
         self.rect = self.image.get_rect()
@@ -1,144 +1,347 @@
+import argparse
+import os
 import pygame
+import random
 import sys
 
-from random import randint
-from time import sleep
-
-from alien import Alien
-from bullet import Bullet, ShockWave
+from actions import FIRE, LEFT, PLAY, RIGHT, SHOCK_WAVE
+from assets import Assets
+from atlas import Atlas
+from audio import AudioEngine
+from bullet import Bullet, ProjectilePool, ShockWave
 from button import Button
 from cat import Cat
-from game_stats import GameStats
+from collision import FleetGrid
+from fleet import Fleet
+from fonts import FontManager
+from game_stats import GAME_OVER, PAUSED, PLAYING, RESPAWNING, GameStats
+from loader import BackgroundLoader
+from profiler import FrameProfiler, StartupTimer
+from renderer import DirtyRenderer, FullRenderer
+from replay import Recorder, replay
 from scoreboard import Scoreboard
-from settings import Settings
-from stars import Stars
+from scores import ScoreStore
+from settings import AUDIO_PROFILES, STRESS_PROFILES, Settings
+from sound_bank import SoundBank
+from starfield import Starfield
 
 
 class CatSaveUs:
     """Overall class to manage game assets and behavior."""
 
-    def __init__(self):
-        """Initialize the game, and create game resources."""
-        pygame.init()
-        self.settings = Settings()
+    def __init__(self, headless=False, seed=None, settings=None):
+        """
+        Initialize the game, and create game resources.
+
+        A headless game needs no display or audio device: it uses SDL's dummy
+        drivers, draws to an offscreen surface, plays no sound, and is driven
+        with step() instead of run_game(). seed overrides Settings.seed, and
+        settings replaces the default Settings.
+
+        Only what the title screen needs is set up here. The audio device,
+        sounds, music and the fonts used later load on a background thread.
+        """
+        # Each step of startup is timed, up to the first frame.
+        self.startup = StartupTimer()
+        self.headless = headless
+        if headless:
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+        # Only the modules the game uses: the display (which brings events
+        # with it) and fonts. The mixer starts on the loading thread; without
+        # it, sound is a no-op.
+        pygame.display.init()
+        pygame.font.init()
+        self.startup.lap('pygame modules')
+        self.settings = settings if settings is not None else Settings()
+
+        # Everything random in the game is drawn from this seed, so a session
+        # can be replayed exactly.
+        if seed is None:
+            seed = self.settings.seed
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
 
         (width, height) = (self.settings.screen_width, self.settings.screen_height)
-        self.screen = pygame.display.set_mode((width, height))
-        # (the pygame method get_rect() returns a Rect object from an image)
-        pygame.display.set_caption("Cat Save Us!")
+        if headless:
+            # Images still need a display format to convert to, so a tiny
+            # dummy window is opened if there isn't one yet.
+            if pygame.display.get_surface() is None:
+                pygame.display.set_mode((1, 1))
+            self.screen = pygame.Surface((width, height)).convert()
+        else:
+            self.screen = pygame.display.set_mode((width, height))
+            # (the pygame method get_rect() returns a Rect object from an image)
+            pygame.display.set_caption("Cat Save Us!")
+        self.startup.lap('display')
+
+        # Images are loaded once here and shared by every sprite that uses them.
+        self.assets = Assets()
+        # Every image is packed into one atlas, which sprites draw from.
+        self.atlas = Atlas(self)
+        self.startup.lap('images')
+
+        # The audio device is opened (in the background) in the settings'
+        # format, and sound effects are decoded once into that format and
+        # played on a pool of channels.
+        self.audio = AudioEngine(self)
+        self.sounds = SoundBank(self)
+
+        # Fonts are looked up once, and rendered text is reused.
+        self.fonts = FontManager(self)
 
         # Create an instance to store game stats and create a scoreboard.
         self.stats = GameStats(self)
+        self.scores = ScoreStore(self)
         self.sb = Scoreboard(self)
+        self.startup.lap('scoreboard')
 
         self.cat = Cat(self)
         # ^^ The self argument here refers to the current instance of CatSaveUs.
-        self.cat_face = Cat(self)
 
-        self.bullets = pygame.sprite.Group()
-        self.shock_waves = pygame.sprite.Group()
-        self.aliens = pygame.sprite.Group()
-        self.stars = pygame.sprite.Group()
+        # Bullets and shockwaves are created once and reused.
+        self.bullets = ProjectilePool(self, Bullet, self.settings.bullets_allowed)
+        self.shock_waves = ProjectilePool(self, ShockWave,
+            self.settings.shock_waves_allowed)
+
+        # The fleet keeps alien positions in arrays; self.aliens is its sprite view.
+        self.fleet = Fleet(self)
+        self.aliens = self.fleet.aliens
+        self.fleet_grid = FleetGrid(self.fleet)
+        self.startup.lap('sprites')
 
-        self._create_starry_sky()
+        # The starry sky is rendered once into a background image.
+        self.starfield = Starfield(self)
+        self.startup.lap('starfield')
         self._create_fleet()
+        self.startup.lap('fleet')
+
+        # The renderer clears the screen from the starry sky's background image.
+        if self.settings.dirty_rect_rendering:
+            self.renderer = DirtyRenderer(self)
+        else:
+            self.renderer = FullRenderer(self)
+        self.renderer.set_background(self.starfield.background)
+
+        # The clock caps the frame rate and measures how long each frame took.
+        self.clock = pygame.time.Clock()
+        self.sim_dt = 1 / self.settings.sim_rate
+        self.accumulator = 0.0
+        # (the number of simulation steps run so far)
+        self.sim_frames = 0
+        # The profiler times each phase of a frame.
+        self.profiler = FrameProfiler(self)
+
+        # (simulated seconds since the last automatic shot, in stress tests)
+        self.auto_fire_time = 0.0
+
+        # Keys held down, and presses waiting for the next simulation step.
+        self.held_actions = set()
+        self.pressed_actions = set()
+
+        # (step, score, level) at every level up and game over, and the
+        # recorder that's writing this session's input to a log, if any.
+        self.checkpoints = []
+        self.recorder = None
 
         # Make the Play button.
         self.play_button = Button(self, "Double Click to Play")
-
-        bg_music = 'sounds/VenusHotline.wav'
-        pygame.mixer.init()
-        pygame.mixer.music.load(bg_music)
-        pygame.mixer.music.play(-1)  # the loop of -1 means this song will repeate indefinitely
-
+        # The pause screen is rendered the first time the game is paused.
+        self.pause_overlay = None
+        self.pause_font_key = ("monospace", 35, True)
+        self.startup.lap('play button')
+
+        # Audio, and the fonts that aren't on the title screen, load while
+        # the title screen is up. A headless game plays no sound, and looks
+        # its fonts up when it needs them.
+        self.loader = BackgroundLoader(self.startup)
+        # (print the startup timings once everything has loaded)
+        self.report_startup = False
+        if not headless:
+            self.loader.add('sounds', self._load_sounds)
+            self.loader.add('music', self.audio.start_music)
+            self.loader.add('fonts', lambda: self.fonts.preload(
+                [self.pause_font_key, self.profiler.font_key]))
+            self.loader.start()
+
+    def _load_sounds(self):
+        """Open the audio device and decode the sound effects."""
+        self.audio.open()
+        self.sounds.load()
 
     def run_game(self):
         """Start the main loop for the game."""
         while True:
-            self._check_events()
+            if self.stats.state == PAUSED:
+                # Sleep until something happens, instead of running frames.
+                self._wait_while_paused()
+                continue
+
+            # Wait out the rest of the frame, then see how long it really took.
+            frame_time = self.clock.tick(self.settings.fps_cap) / 1000
+            frame_time = min(frame_time, self.settings.max_frame_time)
+
+            profiler = self.profiler
+            profiler.begin_frame()
+            with profiler.phase('check_events'):
+                self._check_events()
             # ^^ The above calls a helper method!
-
-            if self.stats.game_active:
-                self.cat.update()
-                # ^^ The cat's position will be updated after checking for keyboard events!
-                self._update_bullets()
-                self._update_shock_waves()
-                self._update_aliens()
-
-            self._update_screen()
+            if self.stats.state == PAUSED:
+                # The pause screen is up; don't draw the game over it. The
+                # frame ends here, so the time paused isn't charged to it.
+                profiler.end_frame()
+                continue
+
+            if self.settings.fixed_timestep:
+                # Run as many fixed steps as fit into the time that has passed,
+                # and keep the remainder for the next frame.
+                self.accumulator += frame_time
+                while self.accumulator >= self.sim_dt:
+                    self._apply_input(self._take_input())
+                    self._update_game(self.sim_dt)
+                    self.accumulator -= self.sim_dt
+            else:
+                self._apply_input(self._take_input())
+                self._update_game(frame_time)
+
+            with profiler.phase('update_screen'):
+                self._update_screen()
             # ^^ Same here!
+            if self.startup.first_frame is None:
+                self.startup.frame_drawn()
+            if self.report_startup and self.loader.done:
+                print("\n".join(self.startup.report()))
+                self.report_startup = False
+            profiler.end_frame()
+
+    def step(self, n_frames=1, inputs=None, render=False):
+        """
+        Advance the game n_frames fixed simulation steps, as fast as possible.
 
-    def _create_starry_sky(self):
-        """Instantiate a sky full of stars for the game's background."""
-
-        # Make a star.
-        star = Stars(self)
-        star_width, star_height = star.rect.size
-        available_space_stars_x = self.settings.screen_width - (star_width)
-        number_stars_x = available_space_stars_x // (star_width)
-
-        # Determine the number of rows of stars that fit on the screen.
-        available_space_stars_y = (self.settings.screen_height - (star_height))
-        star_number_rows = available_space_stars_y // (star_height)
-
-        # Create the full sky of stars.
-        for star_row_number in range(star_number_rows):
-            for star_number in range(number_stars_x):
-                self._create_stars(star_number, star_row_number)
-
-    def _create_stars(self, star_number, star_row_number):
-        star = Stars(self)
-        random_range = randint(-10, 10)
-        random_number = randint(1, 10)
-
-        # star_width, star_height = star.rect.size
-        star.rect.x = random_range + random_number * star.rect.width * star_number
-        star.rect.y = random_range + random_number * star.rect.height * star_row_number
-        self.stars.add(star)
+        inputs, if given, yields one collection of actions (LEFT, RIGHT, FIRE,
+        SHOCK_WAVE, PLAY) per step; steps past its end get no input. The same
+        inputs from the same starting state always give the same game.
+        """
+        if inputs is not None:
+            inputs = iter(inputs)
+        profiler = self.profiler
+        for _ in range(n_frames):
+            # Each step is a frame to the profiler, so its timings roll over.
+            profiler.begin_frame()
+            actions = next(inputs, ()) if inputs is not None else ()
+            self._apply_input(actions)
+            self._update_game(self.sim_dt)
+            if render:
+                self._update_screen()
+            profiler.end_frame()
+
+    def _take_input(self):
+        """Return the live input for the next simulation step."""
+        actions = self.held_actions | self.pressed_actions
+        self.pressed_actions.clear()
+        return actions
+
+    def _apply_input(self, actions):
+        """Act on one simulation step's input."""
+        if self.recorder:
+            self.recorder.record(actions)
+        self.cat.moving_left = LEFT in actions
+        self.cat.moving_right = RIGHT in actions
+        if PLAY in actions and not self.stats.game_active:
+            self.start_game()
+        if self.stats.state == PLAYING:
+            if FIRE in actions:
+                self._fire_bullet()
+            if SHOCK_WAVE in actions:
+                self._fire_shock_wave()
+
+    def start_recording(self, path):
+        """Write every simulation step's input from now on to a log at path."""
+        if not self.settings.fixed_timestep:
+            raise ValueError("only a fixed-timestep game can be recorded")
+        if self.settings.profile not in STRESS_PROFILES:
+            raise ValueError("only games with a named settings profile can be recorded")
+        self.recorder = Recorder(path, self.seed, self.settings.sim_rate,
+            self.settings.profile)
+
+    def checkpoint(self):
+        """Note the current score and level, in the session log too if recording."""
+        checkpoint = (self.sim_frames, self.stats.score, self.stats.level)
+        self.checkpoints.append(checkpoint)
+        if self.recorder:
+            self.recorder.checkpoint(*checkpoint)
+
+    def _update_game(self, dt):
+        """Advance the game by dt seconds."""
+        self.sim_frames += 1
+        self.starfield.update(dt)
+        if self.stats.state in (PLAYING, RESPAWNING):
+            self.stats.play_time += dt
+        if self.stats.state == RESPAWNING:
+            # Everything holds still until the respawn delay has passed.
+            self.stats.respawn_time_left -= dt
+            if self.stats.respawn_time_left <= 0:
+                self.stats.state = PLAYING
+        elif self.stats.state == PLAYING:
+            if self.settings.auto_fire_rate > 0:
+                self._auto_fire(dt)
+            profiler = self.profiler
+            with profiler.phase('cat.update'):
+                self.cat.update(dt)
+            # ^^ The cat's position will be updated after checking for keyboard events!
+            with profiler.phase('update_bullets'):
+                self._update_bullets(dt)
+            with profiler.phase('update_shock_waves'):
+                self._update_shock_waves(dt)
+            with profiler.phase('update_aliens'):
+                self._update_aliens(dt)
+
+    def _auto_fire(self, dt):
+        """Fire bullets at Settings.auto_fire_rate per second, for load testing."""
+        self.auto_fire_time += dt
+        interval = 1 / self.settings.auto_fire_rate
+        while self.auto_fire_time >= interval:
+            self.auto_fire_time -= interval
+            self._fire_bullet()
 
-    def _update_bullets(self):
+    def _update_bullets(self, dt):
         """Update position of bullets and get rid of old bullets."""
         # Update bullet positions.
-        self.bullets.update()
+        self.bullets.update(dt)
         # ^^ Updates the position of the bullets on each pass through
 
         # Get rid of bullets that have disappeared.
-        for bullet in self.bullets.copy():
-            if bullet.rect.bottom <= 0:
-                self.bullets.remove(bullet)
+        self.bullets.cull()
 
         self._check_bullet_alien_collisions()
 
-    def _update_shock_waves(self):
+    def _update_shock_waves(self, dt):
         """Update position of the shockwave and get rid of old shockwaves."""
         # Update shockwave positions.
-        self.shock_waves.update()
+        self.shock_waves.update(dt)
         # ^^ Updates the position of the bullets on each pass through
 
         # Get rid of shockwaves that have disappeared.
-        for shock_wave in self.shock_waves.copy():
-            if shock_wave.rect.bottom <= 0:
-                self.shock_waves.remove(shock_wave)
+        self.shock_waves.cull()
 
         self._check_shock_wave_alien_collisions()
 
     def _check_bullet_alien_collisions(self):
         """Respond to bullet-alien collisions."""
         # Remove any bullets and aliens that have collided.
-        collisions = pygame.sprite.groupcollide(self.bullets, self.aliens, True, True)
-        # ^^ The sprite.groupcollide() function compares the rects of each element
-        # in one group with the rects of each element in another group.
-        collision_sound = pygame.mixer.Sound('sounds/AlienShipCrash.wav')
-        collision_sound.set_volume(0.3)
+        collisions = self.fleet_grid.groupcollide(self.bullets, True, True)
+        # ^^ This works like pygame.sprite.groupcollide(), but only compares each
+        # bullet's rect with the aliens in the fleet grid cells it overlaps.
 
         if collisions:
-            pygame.mixer.Sound.play(collision_sound)
+            self.sounds.play('alien_hit')
             for aliens in collisions.values():
                 self.stats.score += self.settings.alien_points * len(aliens)
             self.sb.prep_score()
             self.sb.check_high_score()
 
-        if not self.aliens:
+        if self.fleet.cleared():
             # Destroy existing bullets and create a new fleet.
             self.bullets.empty()
             self._create_fleet()
@@ -147,33 +350,31 @@ class CatSaveUs:
             # Increase level.
             self.stats.level += 1
             self.sb.prep_level()
+            self.checkpoint()
 
     def _check_shock_wave_alien_collisions(self):
         """Respond to shockwave-alien collisions."""
         # Remove any bullets and aliens that have collided.
-        shock_wave_collisions = pygame.sprite.groupcollide(self.shock_waves, self.aliens, False, True)
-        # ^^ The sprite.groupcollide() function compares the rects of each element
-        # in one group with the rects of each element in another group.
-        shockwave_sound = pygame.mixer.Sound('sounds/ShockWaveHit.wav')
-        shockwave_sound.set_volume(0.4)
+        shock_wave_collisions = self.fleet_grid.groupcollide(self.shock_waves, False, True)
+        # ^^ This works like pygame.sprite.groupcollide(), but only compares each
+        # shockwave's rect with the aliens in the fleet grid cells it overlaps.
 
         if shock_wave_collisions:
-            pygame.mixer.Sound.play(shockwave_sound)
+            self.sounds.play('shock_wave_hit')
             for aliens in shock_wave_collisions.values():
                 self.stats.score += self.settings.alien_points * len(aliens)
             self.sb.prep_score()
             self.sb.check_high_score()
 
-    def _update_aliens(self):
+    def _update_aliens(self, dt):
         """
         Check if the fleet is at an edge, then update the
         positions of all aliens in the fleet.
         """
-        self._check_fleet_edges()
-        self.aliens.update()
+        self.fleet.update(dt)
 
         # Look for alien-cat collisions.
-        if pygame.sprite.spritecollideany(self.cat, self.aliens):
+        if self.fleet_grid.spritecollideany(self.cat):
             self._cat_hit()
 
         # Look for aliens hitting the bottom of the screen.
@@ -181,12 +382,8 @@ class CatSaveUs:
 
     def _cat_hit(self):
         """Respond to the cat being hit by an alien ship."""
-        cat_hit_sound = pygame.mixer.Sound('sounds/CatHit.wav')
-        game_over_sound = pygame.mixer.Sound('sounds/GameOver.wav')
-        last_cat_sound = pygame.mixer.Sound('sounds/CatMeow.wav')
-
         if self.stats.cats_left > 0:
-            pygame.mixer.Sound.play(cat_hit_sound)
+            self.sounds.play('cat_hit')
 
             # Decrement cats_left, and update scoreboard.
             self.stats.cats_left -= 1
@@ -201,13 +398,17 @@ class CatSaveUs:
             self._create_fleet()
             self.cat.center_cat()
 
-            # Pause.
-            sleep(1)
+            # Pause. This is simulated time, so events and drawing go on meanwhile.
+            self.stats.state = RESPAWNING
+            self.stats.respawn_time_left = self.settings.respawn_delay
         else:
-            pygame.mixer.Sound.play(game_over_sound)
-            pygame.mixer.Sound.play(last_cat_sound)
-            self.stats.game_active = False
-            pygame.mouse.set_visible(True)
+            self.sounds.play('game_over')
+            self.sounds.play('last_cat')
+            self.stats.state = GAME_OVER
+            self.checkpoint()
+            if not self.headless:
+                pygame.mouse.set_visible(True)
+            self._record_run()
 
     def _check_events(self):
         # This is a helper method, for refactoring practice!!
@@ -218,7 +419,7 @@ class CatSaveUs:
             # This function returns a list of events that have taken place
             # since the last time this function was called.
             if event.type == pygame.QUIT:
-                sys.exit()
+                self._quit()
             elif event.type == pygame.KEYDOWN:
                 self._check_keydown_events(event)
             elif event.type == pygame.KEYUP:
@@ -230,46 +431,93 @@ class CatSaveUs:
                     mouse_pos = pygame.mouse.get_pos()
                     self._check_play_button(mouse_pos)
 
+    def _record_run(self):
+        """Save the game's run in the score database."""
+        stats = self.stats
+        self.scores.record_run(stats.score, stats.level, stats.play_time, self.seed,
+            self.settings.profile, self.settings.overrides)
+
+    def _quit(self):
+        """Save the run, session log and profile, and leave the game."""
+        # A game quit partway through still counts as a run.
+        if self.stats.game_active:
+            self._record_run()
+        self.scores.close()
+        if self.recorder:
+            self.checkpoint()
+            self.recorder.close()
+        self.profiler.finish_capture()
+        # A load that's still going must finish before pygame shuts down.
+        self.loader.stop()
+        pygame.quit()
+        sys.exit()
+
     def pause(self):
+        """Pause the game and show the pause screen."""
+        if self.stats.state not in (PLAYING, RESPAWNING):
+            return
+        self.stats.resume_state = self.stats.state
+        self.stats.state = PAUSED
+        self._draw_pause_screen()
+
+    def _draw_pause_screen(self):
+        """Draw the pause screen, rendering its text the first time."""
+        if self.pause_overlay is None:
+            font_key = self.pause_font_key
+            text1 = self.fonts.render("PAUSED", font_key, (70, 160, 190))
+            text2 = self.fonts.render("(press C to continue or Q to quit)", font_key,
+                (70, 160, 190))
+            self.pause_overlay = [(text1, (200, 100)), (text2, (200, 200))]
+
         self.screen.fill((0, 0, 0))
-        my_font = pygame.font.SysFont("monospace", 35, True)
-
-        text1 = my_font.render("PAUSED", 40, (70, 160, 190))
-        text2 = my_font.render("(press C to continue or Q to quit)", 40, (70, 160, 190))
-        self.screen.blit(text2, (200, 200))
-        self.screen.blit(text1, (200, 100))
-
-        pygame.display.update()
-
-        paused = True
-        while paused:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    quit()
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_c:
-                        paused = False
-                    elif event.key == pygame.K_q:
-                        pygame.quit()
-                        quit()
-
-            pygame.display.update()
+        self.screen.blits(self.pause_overlay, doreturn=False)
+        if not self.headless:
+            pygame.display.flip()
+
+    def _wait_while_paused(self):
+        """Block until the next event, and respond to it the way the pause screen does."""
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            self._quit()
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_c:
+                self._resume()
+            elif event.key == pygame.K_q:
+                self._quit()
+        elif event.type == pygame.KEYUP:
+            # Keys let go of while paused mustn't stay held afterwards.
+            self._check_keyup_events(event)
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            # Only redraw when the window asks for it.
+            self._draw_pause_screen()
+
+    def _resume(self):
+        """Continue the paused game where it left off."""
+        self.stats.state = self.stats.resume_state
+        # Don't count the time spent paused as one long frame.
+        self.clock.tick()
+        # The pause text covered the screen, so the next frame redraws all of it.
+        self.renderer.invalidate()
 
     def _check_play_button(self, mouse_pos):
         """Start a new game when the player clicks Play."""
         button_clicked = self.play_button.rect.collidepoint(mouse_pos)
         if button_clicked and not self.stats.game_active:
-            # Reset the game settings.
-            self.settings.initialize_dynamic_settings()
-            # Reset the game statistics.
-            self.stats.reset_stats()
-            self.stats.game_active = True
-            self.sb.prep_score()
-            self.sb.prep_level()
-            self.sb.prep_cats()
-
-            # Hide the mouse cursor.
+            self.pressed_actions.add(PLAY)
+
+    def start_game(self):
+        """Reset the settings and statistics, and start a new game."""
+        # Reset the game settings.
+        self.settings.initialize_dynamic_settings()
+        # Reset the game statistics.
+        self.stats.reset_stats()
+        self.stats.state = PLAYING
+        self.sb.prep_score()
+        self.sb.prep_level()
+        self.sb.prep_cats()
+
+        # Hide the mouse cursor.
+        if not self.headless:
             pygame.mouse.set_visible(False)
 
         # Get rid of any remaining aliens and bullets.
@@ -284,130 +532,220 @@ class CatSaveUs:
     def _check_keydown_events(self, event):
         """Respond to keypresses."""
         if event.key == pygame.K_RIGHT:
-            self.cat.moving_right = True
+            self.held_actions.add(RIGHT)
         elif event.key == pygame.K_LEFT:
-            self.cat.moving_left = True
+            self.held_actions.add(LEFT)
         elif event.key == pygame.K_q:
-            sys.exit()
+            self._quit()
         elif event.key == pygame.K_p:
             self.pause()
         elif event.key == pygame.K_SPACE:
-            self._fire_bullet()
+            self.pressed_actions.add(FIRE)
         elif event.key == pygame.K_LSHIFT:
-            self._fire_shock_wave()
+            self.pressed_actions.add(SHOCK_WAVE)
+        elif event.key == pygame.K_F3:
+            self.profiler.toggle_overlay()
+        # ^^ Moving and firing happen at the next simulation step.
 
     def _check_keyup_events(self, event):
         """Respond to key releases."""
         if event.key == pygame.K_RIGHT:
-            self.cat.moving_right = False
+            self.held_actions.discard(RIGHT)
         elif event.key == pygame.K_LEFT:
-            self.cat.moving_left = False
+            self.held_actions.discard(LEFT)
 
     def _fire_bullet(self):
-        """Create a new bullet and add it to the bullets group."""
-        cat_bullet_sound = pygame.mixer.Sound('sounds/CatBullet.wav')
-        cat_bullet_sound.set_volume(0.5)
-
-        if len(self.bullets) < self.settings.bullets_allowed:
-            new_bullet = Bullet(self)
-            pygame.mixer.Sound.play(cat_bullet_sound)
-            self.bullets.add(new_bullet)
+        """Fire a free bullet from the bullets pool."""
+        if self.bullets.fire():
+            self.sounds.play('bullet')
 
     def _fire_shock_wave(self):
-        """Create a new shockwave and add it to the shockwaves group."""
-        cat_shockwave_sound = pygame.mixer.Sound('sounds/EmitShockwave.wav')
-        cat_shockwave_sound.set_volume(0.5)
-
-        if len(self.shock_waves) < self.settings.shock_waves_allowed:
-            new_shock_wave = ShockWave(self)
-            pygame.mixer.Sound.play(cat_shockwave_sound)
-            self.shock_waves.add(new_shock_wave)
+        """Fire a free shockwave from the shockwaves pool."""
+        if self.shock_waves.fire():
+            self.sounds.play('shock_wave')
 
     def _create_fleet(self):
         """Create the fleet of aliens."""
-        # Make an alien.
-        alien = Alien(self)
-
-        # Create an alien and find the number of aliens in a row.
-        # Spacing between each alien is equal to one alien width.
-        alien_width, alien_height = alien.rect.size
-        available_space_x = self.settings.screen_width - (alien_width)
-        number_aliens_x = available_space_x // (2 * alien_width)
-
-        # Determine the number of rows of aliens that fit on the screen.
-        cat_height = self.cat.rect.height
-        available_space_y = (self.settings.screen_height -
-                                (2 * alien_height) - cat_height)
-        number_rows = available_space_y // (2 * alien_height)
-
-        # Create the full fleet of aliens.
-        for row_number in range(number_rows):
-            for alien_number in range(number_aliens_x):
-                self._create_alien(alien_number, row_number)
-
-    def _create_alien(self, alien_number, row_number):
-        # Create an alien and place it in the row.
-        alien = Alien(self)
-        alien_width, alien_height = alien.rect.size
-        alien.x = alien_width + 2 * alien_width * alien_number
-        alien.rect.x = alien.x
-        alien.rect.y = alien.rect.height + 2 * alien.rect.height * row_number
-        self.aliens.add(alien)
-
-    def _check_fleet_edges(self):
-        """Respond appropriately if any aliens have reached an edge."""
-        for alien in self.aliens.sprites():
-            if alien.check_edges():
-                self._change_fleet_direction()
-                break
-
-    def _change_fleet_direction(self):
-        """Drop the entire fleet and change the fleet's direction."""
-        for alien in self.aliens.sprites():
-            alien.rect.y += self.settings.fleet_drop_speed
-        self.settings.fleet_direction *= -1
+        self.fleet.create()
 
     def _check_aliens_bottom(self):
         """Check if any aliens have reached the bottom of the screen."""
-        screen_rect = self.screen.get_rect()
-        for alien in self.aliens.sprites():
-            if alien.rect.bottom >= screen_rect.bottom:
-                # Treat this the same as if the cat (player) got hit.
-                self._cat_hit()
-                break
+        if self.fleet.reached_bottom():
+            # Treat this the same as if the cat (player) got hit.
+            self._cat_hit()
 
     def _update_screen(self):
         """Update images on the screen, and flip to a new screen."""
-        # Set the background color.
-        # Redraw the screen during each pass through the loop.
-        self.screen.fill(self.settings.bg_color)
-        # ^^ Here we fill the screen with the background color using the fill()
-        # method, which acts on a surface and takes only one argument: a color.
-        self.stars.draw(self.screen)
-        self.cat.blitme()
-        for bullet in self.bullets.sprites():
-            bullet.draw_bullet()
-        for shock_wave in self.shock_waves.sprites():
-            shock_wave.draw_shock_wave()
-        self.aliens.draw(self.screen)
-
-        # Draw the score information.
-        self.sb.show_score()
-        self.sb.prep_high_score()
+        # Redraw the background (color and stars) during each pass through the loop.
+        if self.starfield.scrolling:
+            # Moving stars change the whole background, so all of it is redrawn.
+            self.renderer.invalidate()
+        self.renderer.clear()
+        # ^^ The renderer either covers the whole screen with the background, or
+        # only the places where something was drawn last frame.
+        if self.starfield.scrolling:
+            self.starfield.draw(self.screen)
+
+        # The sprites and the score information are gathered into one batch
+        # and drawn with a single blits() call. Everything we draw reports
+        # the rect it covered.
+        batch = self.renderer.batch
+        batch.add(self.cat.image, self.cat.rect)
+        batch.add_sprites(self.bullets)
+        batch.add_sprites(self.shock_waves)
+        batch.add_sprites(self.aliens)
+        self.sb.show_score(batch)
+        rects = batch.flush()
+
         # Draw the play button if the game is inactive.
         if not self.stats.game_active:
-            self.play_button.draw_button()
+            rects.extend(self.play_button.draw_button())
+        # Draw the performance overlay if it's shown.
+        rects.extend(self.profiler.draw(self.screen))
 
         # Make the most recently drawn screen visible.
-        pygame.display.flip()
-        # ^^ When we move the game elements around, pygame.display.flip() continually
-        # updates the display to show the new positions of game elements and hides
-        # the old ones, creating the illusion of smooth movement.
+        self.renderer.present(rects)
+        # ^^ When we move the game elements around, the display is updated to show
+        # the new positions of game elements and hide the old ones, creating the
+        # illusion of smooth movement.
+
+
+def parse_size(text):
+    """Return (width, height) from WIDTHxHEIGHT, both whole numbers above zero."""
+    width, _, height = text.partition('x')
+    try:
+        size = int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError("{!r} isn't of the form WIDTHxHEIGHT".format(text))
+    if min(size) <= 0:
+        raise argparse.ArgumentTypeError("both sizes in {!r} must be above zero".format(text))
+    return size
+
+
+def parse_frames(text):
+    """Return (start, end) from START:END, frame numbers with start no later than end."""
+    start, _, end = text.partition(':')
+    try:
+        frames = int(start), int(end)
+    except ValueError:
+        raise argparse.ArgumentTypeError("{!r} isn't of the form START:END".format(text))
+    if not 0 <= frames[0] <= frames[1]:
+        raise argparse.ArgumentTypeError(
+            "{!r} must count up from frame 0 or later".format(text))
+    return frames
+
+
+def parse_count(text):
+    """Return a whole number above zero."""
+    try:
+        count = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError("{!r} isn't a whole number".format(text))
+    if count <= 0:
+        raise argparse.ArgumentTypeError("{!r} must be above zero".format(text))
+    return count
+
+
+def parse_rate(text):
+    """Return a rate per second that's zero (off) or more."""
+    try:
+        rate = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError("{!r} isn't a number".format(text))
+    if not 0 <= rate < float('inf'):
+        raise argparse.ArgumentTypeError("the rate must be zero or more")
+    return rate
+
+
+def parse_spacing(text):
+    """Return a fleet spacing, a number of alien widths that's zero or more."""
+    try:
+        spacing = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError("{!r} isn't a number".format(text))
+    if not 0 <= spacing < float('inf'):
+        raise argparse.ArgumentTypeError("the spacing must be zero or more")
+    return spacing
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Cat Save Us!")
+    parser.add_argument('--seed', type=int, help="random seed for the game")
+    parser.add_argument('--record', metavar='PATH', help="record the session's input to PATH")
+    parser.add_argument('--replay', metavar='PATH',
+        help="replay a recorded session headless and check its score and levels")
+    parser.add_argument('--profile-frames', type=parse_frames, metavar='START:END',
+        help="profile frames START to END (use with --profile-output; default: 0:599)")
+    parser.add_argument('--profile-output', metavar='PATH',
+        help="write the profile to PATH: a Chrome trace if it ends in .json, "
+            "otherwise cProfile stats")
+    parser.add_argument('--stress', metavar='PROFILE', choices=list(STRESS_PROFILES),
+        help="load-test settings: {}".format(', '.join(STRESS_PROFILES)))
+    parser.add_argument('--resolution', type=parse_size, metavar='WxH',
+        help="window size, e.g. 2700x1600")
+    parser.add_argument('--fleet-spacing', type=parse_spacing, metavar='ALIENS',
+        help="gap between aliens, in alien widths (default: 1)")
+    parser.add_argument('--fleet', type=parse_size, metavar='COLUMNSxROWS',
+        help="fleet size, instead of as many aliens as fit on the screen")
+    parser.add_argument('--bullets', type=parse_count, help="how many bullets can be in flight")
+    parser.add_argument('--auto-fire', type=parse_rate, metavar='RATE',
+        help="fire RATE bullets per second automatically")
+    parser.add_argument('--audio', metavar='PROFILE', choices=list(AUDIO_PROFILES),
+        help="mixer format: {}".format(', '.join(AUDIO_PROFILES)))
+    parser.add_argument('--startup-times', action='store_true',
+        help="print how long each step of startup took")
+    args = parser.parse_args()
+    if args.profile_frames and not args.profile_output:
+        parser.error("--profile-frames needs --profile-output")
+
+    if args.replay:
+        recorded, replayed = replay(args.replay)
+        for step, score, level in replayed:
+            print("step {:>8}  score {:>10,}  level {}".format(step, score, level))
+        if recorded != replayed:
+            sys.exit("The replay doesn't match the recorded session.")
+        print("The replay matches the recorded session.")
+        sys.exit()
+
+    settings = Settings()
+    if args.stress:
+        settings.apply_profile(args.stress)
+    if args.audio:
+        settings.audio_profile = args.audio
+    overrides = {}
+    if args.resolution:
+        width, height = args.resolution
+        overrides.update(screen_width=width, screen_height=height)
+    if args.fleet:
+        columns, rows = args.fleet
+        overrides.update(fleet_columns=columns, fleet_rows=rows)
+    if args.fleet_spacing is not None:
+        overrides['fleet_spacing'] = args.fleet_spacing
+    if args.bullets is not None:
+        overrides['bullets_allowed'] = args.bullets
+    if args.auto_fire is not None:
+        overrides['auto_fire_rate'] = args.auto_fire
+    if overrides:
+        # Settings that aren't a named profile can't be replayed from a log.
+        if args.record:
+            parser.error("--record only works with --stress profiles, not {}".format(
+                ", ".join(sorted(overrides))))
+        settings.override(overrides)
+        settings.profile = 'custom'
+
     # Make a game instance, and run the game.
-    ai = CatSaveUs()
+    try:
+        ai = CatSaveUs(seed=args.seed, settings=settings)
+    except ValueError as e:
+        # (settings that make no playable game, such as a screen too small
+        # for a row of aliens)
+        parser.error(str(e))
+    ai.report_startup = args.startup_times
+    if args.record:
+        ai.start_recording(args.record)
+    if args.profile_output:
+        start, end = args.profile_frames or (0, 599)
+        ai.profiler.capture(start, end, args.profile_output)
     ai.run_game()
     # ^^ Here we create an instance of the game, and then call run_game(). We place run_game()
     # in an if block that only runs if the file is called directly.
@@ -0,0 +1,86 @@
+import math
+
+
+class FleetGrid:
+    """
+    A class to find collisions with the fleet without testing every alien.
+
+    pygame.sprite.groupcollide() tests every projectile against every alien.
+    The fleet is a regular grid, though, so the rows and columns a rect can
+    touch follow directly from its position. Only the aliens in those cells
+    are tested, with the same rect test groupcollide uses.
+    """
+
+    def __init__(self, fleet):
+        """Initialize the grid for fleet."""
+        self.fleet = fleet
+
+    def _layout(self):
+        """Return the fleet's grid layout for _collide(), or None if it's empty."""
+        fleet = self.fleet
+        if not fleet.rows or not fleet.columns:
+            return None
+        return (math.floor(fleet.x[0]), math.floor(fleet.y[0]),
+            fleet.alien_width, fleet.alien_height, fleet.pitch_x, fleet.pitch_y,
+            fleet.rows, fleet.columns, fleet.sprites, fleet.alive)
+
+    @staticmethod
+    def _collide(rect, layout, dokill, first_only=False):
+        """Return the live aliens that collide with rect, in fleet order."""
+        (origin_x, origin_y, alien_width, alien_height, pitch_x, pitch_y,
+            rows, columns, sprites, alive) = layout
+
+        # Rows and columns whose aliens reach past rect's top-left corner and
+        # start before its bottom-right corner. The range is widened by one
+        # cell on each side, since every alien rounds its own position.
+        first_row = max(0, (rect.top - origin_y - alien_height) // pitch_y)
+        last_row = min(rows - 1, (rect.bottom - origin_y) // pitch_y + 1)
+        if first_row > last_row:
+            return []
+        first_column = max(0, (rect.left - origin_x - alien_width) // pitch_x)
+        last_column = min(columns - 1, (rect.right - origin_x) // pitch_x + 1)
+        if first_column > last_column:
+            return []
+
+        hits = []
+        for row in range(first_row, last_row + 1):
+            for index in range(row * columns + first_column, row * columns + last_column + 1):
+                alien = sprites[index]
+                # Dead aliens keep their last rect, so check alive after a hit.
+                if rect.colliderect(alien.rect) and alive[index]:
+                    hits.append(alien)
+                    if first_only:
+                        return hits
+                    if dokill:
+                        alien.kill()
+        return hits
+
+    def spritecollide(self, sprite, dokill):
+        """Return the live aliens that collide with sprite, like spritecollide()."""
+        layout = self._layout()
+        if layout is None:
+            return []
+        return self._collide(sprite.rect, layout, dokill)
+
+    def spritecollideany(self, sprite):
+        """Return a live alien that collides with sprite, or None."""
+        layout = self._layout()
+        if layout is None:
+            return None
+        hits = self._collide(sprite.rect, layout, False, first_only=True)
+        return hits[0] if hits else None
+
+    def groupcollide(self, group, dokill_group, dokill_aliens):
+        """Return {sprite: [aliens hit]} for sprites in group, like groupcollide()."""
+        crashed = {}
+        layout = self._layout()
+        if layout is None:
+            return crashed
+        collide = self._collide
+        for sprite in group.sprites():
+            hits = collide(sprite.rect, layout, dokill_aliens)
+            if hits:
+                crashed[sprite] = hits
+                if dokill_group:
+                    sprite.kill()
+        return crashed
@@ -0,0 +1,223 @@
+"""
+A reinforcement-learning style environment around a headless game.
+
+CatSaveUsEnv follows the Gymnasium API: reset() starts a new game and
+step(action) advances it, returning (observation, reward, terminated,
+truncated, info). Actions are indexes into ACTIONS, and go straight to the
+game's input handling, with no pygame events involved. The reward is the
+score gained during the step.
+
+Observations are dicts of NumPy arrays with shapes fixed by the settings:
+
+    cat          (2,)          the cat's center
+    aliens       (slots, 3)    x, y and alive for every slot in the fleet
+    bullets      (capacity, 3) x, y and active for every bullet in the pool
+    shock_waves  (capacity, 3) the same, for shockwaves
+    screen       (h, w, 3)     the screen, every screen_step-th pixel (optional)
+
+VectorEnv steps several games in lock-step, and stacks their observations.
+"""
+import copy
+
+import numpy as np
+import pygame
+
+from actions import FIRE, LEFT, PLAY, RIGHT, SHOCK_WAVE
+from game_stats import GAME_OVER
+from settings import Settings
+
+
+# The discrete actions an agent can take, by index.
+ACTIONS = (
+    frozenset(),
+    frozenset({LEFT}),
+    frozenset({RIGHT}),
+    frozenset({FIRE}),
+    frozenset({LEFT, FIRE}),
+    frozenset({RIGHT, FIRE}),
+    frozenset({SHOCK_WAVE}),
+)
+
+
+class CatSaveUsEnv:
+    """A class to drive one headless game one action at a time."""
+
+    def __init__(self, seed=None, settings=None, frame_skip=1, screen_step=None,
+            max_steps=None):
+        """
+        Create the game, ready for reset().
+
+        Each action is held for frame_skip simulation steps. With screen_step,
+        the game is drawn every step and the observation includes the screen,
+        keeping every screen_step-th pixel across and down. An episode is cut
+        short (truncated) after max_steps actions.
+        """
+        # Imported here, since the game pulls in everything else.
+        from cat_save_us import CatSaveUs
+
+        if settings is None:
+            settings = Settings()
+        self.ai_game = CatSaveUs(headless=True, seed=seed, settings=settings)
+        self.frame_skip = frame_skip
+        self.screen_step = screen_step
+        self.max_steps = max_steps
+        self.steps = 0
+
+        # The observation's fixed shapes.
+        ai_game = self.ai_game
+        fleet_slots = len(ai_game.fleet.alive)
+        self.shapes = {
+            'cat': (2,),
+            'aliens': (fleet_slots, 3),
+            'bullets': (self._capacity(ai_game.bullets), 3),
+            'shock_waves': (self._capacity(ai_game.shock_waves), 3),
+        }
+        if screen_step:
+            width, height = ai_game.screen.get_size()
+            self.shapes['screen'] = (len(range(0, height, screen_step)),
+                len(range(0, width, screen_step)), 3)
+
+    @staticmethod
+    def _capacity(pool):
+        """Return how many projectiles a pool holds, in flight or free."""
+        return len(pool) + len(pool.free)
+
+    def reset(self, seed=None):
+        """Start a new game; return the first observation and info."""
+        ai_game = self.ai_game
+        if seed is not None and seed != ai_game.seed:
+            # The seed only changes the starry sky.
+            ai_game.seed = seed
+            ai_game.starfield.rebuild(seed)
+            ai_game.renderer.set_background(ai_game.starfield.background)
+        ai_game.stats.state = GAME_OVER
+        ai_game.step(1, [{PLAY}], render=bool(self.screen_step))
+        self.steps = 0
+        return self.observe(), self._info()
+
+    def step(self, action):
+        """Take action; return (observation, reward, terminated, truncated, info)."""
+        reward, terminated, truncated = self._advance(action)
+        return self.observe(), reward, terminated, truncated, self._info()
+
+    def _advance(self, action):
+        """Play action for frame_skip steps; return (reward, terminated, truncated)."""
+        ai_game = self.ai_game
+        stats = ai_game.stats
+        score = stats.score
+        actions = ACTIONS[action]
+        for _ in range(self.frame_skip):
+            ai_game._apply_input(actions)
+            ai_game._update_game(ai_game.sim_dt)
+            if not stats.game_active:
+                break
+        if self.screen_step:
+            ai_game._update_screen()
+        self.steps += 1
+
+        terminated = not stats.game_active
+        truncated = not terminated and self.max_steps is not None and (
+            self.steps >= self.max_steps)
+        return stats.score - score, terminated, truncated
+
+    def observe(self, out=None):
+        """Return the observation, written into the arrays of out if given."""
+        if out is None:
+            out = {name: np.zeros(shape, dtype=np.uint8 if name == 'screen' else np.float32)
+                for name, shape in self.shapes.items()}
+        ai_game = self.ai_game
+
+        out['cat'][:] = ai_game.cat.rect.center
+
+        fleet = ai_game.fleet
+        aliens = out['aliens']
+        aliens[:, 0] = fleet.x + fleet.alien_width / 2
+        aliens[:, 1] = fleet.y + fleet.alien_height / 2
+        aliens[:, 2] = fleet.alive
+
+        self._observe_pool(ai_game.bullets, out['bullets'])
+        self._observe_pool(ai_game.shock_waves, out['shock_waves'])
+
+        if self.screen_step:
+            # pixels3d() is a view of the screen's own pixels, (x, y) ordered,
+            # so striding and transposing it copies nothing; only the pixels
+            # kept are copied out. The view locks the screen until it's freed.
+            step = self.screen_step
+            pixels = pygame.surfarray.pixels3d(ai_game.screen)
+            np.copyto(out['screen'], pixels[::step, ::step].transpose(1, 0, 2))
+            del pixels
+        return out
+
+    @staticmethod
+    def _observe_pool(pool, array):
+        """Write the centers of a pool's projectiles in flight into array."""
+        array[:] = 0
+        for row, projectile in enumerate(pool.spritedict):
+            array[row] = (projectile.rect.centerx, projectile.rect.centery, 1)
+
+    def _info(self):
+        """Return the game's progress, for logging."""
+        stats = self.ai_game.stats
+        return {'score': stats.score, 'level': stats.level, 'cats_left': stats.cats_left}
+
+
+class VectorEnv:
+    """
+    A class to step several games in lock-step within one process.
+
+    Observations are the single game's arrays with a leading game axis.
+    A game that ends is reset right away; its final observation and info
+    are kept under 'final_observation' and 'final_info' in that game's info.
+    """
+
+    def __init__(self, count, seed=0, **env_options):
+        """Create count games, seeded seed, seed + 1, ...; options go to CatSaveUsEnv."""
+        settings = env_options.pop('settings', None) or Settings()
+        # Every game gets settings of its own, since the game changes them.
+        self.envs = [CatSaveUsEnv(seed=seed + number, settings=copy.deepcopy(settings),
+                **env_options)
+            for number in range(count)]
+        self.seed = seed
+        self.observations = {name: np.zeros((count,) + shape,
+                dtype=np.uint8 if name == 'screen' else np.float32)
+            for name, shape in self.envs[0].shapes.items()}
+        self.rewards = np.zeros(count, dtype=np.float32)
+        self.terminated = np.zeros(count, dtype=bool)
+        self.truncated = np.zeros(count, dtype=bool)
+
+    def _game_observation(self, number):
+        """Return views of game number's row in each observation array."""
+        return {name: array[number] for name, array in self.observations.items()}
+
+    def reset(self):
+        """Start a new game everywhere; return the stacked observations and infos."""
+        infos = []
+        for number, env in enumerate(self.envs):
+            env.reset(seed=self.seed + number)
+            env.observe(self._game_observation(number))
+            infos.append(env._info())
+        return self.observations, infos
+
+    def step(self, actions):
+        """
+        Take one action per game; return the stacked observations, rewards,
+        terminated and truncated flags, and a list of infos.
+        """
+        infos = []
+        for number, (env, action) in enumerate(zip(self.envs, actions)):
+            reward, terminated, truncated = env._advance(action)
+            info = env._info()
+            if terminated or truncated:
+                # The reset overwrites the game's rows, so the last
+                # observation goes in the info as arrays of its own.
+                final_observation = env.observe()
+                env.reset()
+                info = dict(env._info(), final_observation=final_observation,
+                    final_info=info)
+            self.rewards[number] = reward
+            self.terminated[number] = terminated
+            self.truncated[number] = truncated
+            # Each game writes its observation straight into its own rows.
+            env.observe(self._game_observation(number))
+            infos.append(info)
+        return self.observations, self.rewards, self.terminated, self.truncated, infos
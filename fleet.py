@@ -0,0 +1,164 @@
+import numpy as np
+from pygame.sprite import Group
+
+from alien import Alien
+
+
+class FleetGroup(Group):
+    """A sprite group that tells its fleet when an alien is removed from it."""
+
+    def __init__(self, fleet):
+        """Initialize the group as the sprite view of fleet."""
+        super().__init__()
+        self.fleet = fleet
+
+    def remove_internal(self, sprite):
+        """Remove sprite, and mark its alien dead in the fleet's arrays."""
+        super().remove_internal(sprite)
+        self.fleet.alive[sprite.index] = False
+
+
+class Fleet:
+    """
+    A class to move the whole fleet of aliens at once.
+
+    The position and state of every alien live in NumPy arrays, so moving the
+    fleet and checking its edges and the bottom of the screen are single array
+    operations. The aliens group is a thin view of those arrays: it holds the
+    live Alien sprites, so drawing and collisions work as before.
+
+    A new fleet enters one row at a time, every fleet_spawn_interval seconds,
+    so laying out a big fleet never costs one long frame. Rows still waiting
+    to enter move with the rest of the fleet, but aren't alive yet.
+    """
+
+    def __init__(self, ai_game):
+        """Initialize an empty fleet."""
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+
+        alien_image = ai_game.atlas.image('alien')
+        self.alien_width, self.alien_height = alien_image.get_size()
+
+        self.aliens = FleetGroup(self)
+        # Alien sprites are kept between fleets and reused.
+        self.sprites = []
+
+        # The fleet is a regular grid: slot (row, column) is at
+        # (x[0] + column * pitch_x, y[0] + row * pitch_y).
+        self.rows = 0
+        self.columns = 0
+        self.pitch_x = 0
+        self.pitch_y = 0
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.alive = np.zeros(0, dtype=bool)
+
+        # Rows that have entered so far, and simulated seconds since the last one.
+        self.spawned_rows = 0
+        self.spawn_time = 0.0
+
+    def create(self):
+        """Lay out a new fleet, and bring in its first row of aliens."""
+        self.aliens.empty()
+
+        # Spacing between each alien is equal to fleet_spacing alien widths
+        # (one, unless a stress profile packs them tighter).
+        alien_width, alien_height = self.alien_width, self.alien_height
+        spacing = self.settings.fleet_spacing
+        self.pitch_x = max(1, round(alien_width * (1 + spacing)))
+        self.pitch_y = max(1, round(alien_height * (1 + spacing)))
+        available_space_x = self.settings.screen_width - (alien_width)
+        self.columns = self.settings.fleet_columns or available_space_x // self.pitch_x
+
+        # Determine the number of rows of aliens that fit on the screen.
+        cat_height = self.ai_game.cat.rect.height
+        available_space_y = (self.settings.screen_height -
+                                (2 * alien_height) - cat_height)
+        self.rows = self.settings.fleet_rows or available_space_y // self.pitch_y
+        if self.rows <= 0 or self.columns <= 0:
+            raise ValueError("a {}x{} screen has no room for a row of aliens".format(
+                self.settings.screen_width, self.settings.screen_height))
+
+        # Lay out the full fleet, one alien per array slot, row by row.
+        row_numbers, alien_numbers = np.divmod(np.arange(self.rows * self.columns),
+            self.columns)
+        self.x = (alien_width + self.pitch_x * alien_numbers).astype(float)
+        self.y = (alien_height + self.pitch_y * row_numbers).astype(float)
+        self.alive = np.zeros(self.rows * self.columns, dtype=bool)
+
+        while len(self.sprites) < len(self.alive):
+            alien = Alien(self.ai_game)
+            alien.index = len(self.sprites)
+            self.sprites.append(alien)
+
+        self.spawned_rows = 0
+        self.spawn_time = 0.0
+        # (an interval of 0 brings in the whole fleet at once)
+        self._spawn_rows(1 if self.settings.fleet_spawn_interval else self.rows)
+        self._sync_rects()
+
+    def cleared(self):
+        """Return True if every alien is dead and no more rows are coming."""
+        # (an empty layout was never a fleet to clear)
+        return self.rows > 0 and self.spawned_rows == self.rows and not self.aliens
+
+    def _spawn_rows(self, count):
+        """Bring the next count rows of the fleet to life."""
+        start = self.spawned_rows * self.columns
+        self.spawned_rows = min(self.rows, self.spawned_rows + count)
+        end = self.spawned_rows * self.columns
+        self.alive[start:end] = True
+        self.aliens.add(self.sprites[start:end])
+
+    def _spawn_due_rows(self, dt):
+        """Bring in the rows whose turn to enter has come."""
+        if self.spawned_rows == self.rows:
+            return
+        self.spawn_time += dt
+        interval = self.settings.fleet_spawn_interval
+        count = 0
+        while self.spawn_time >= interval:
+            self.spawn_time -= interval
+            count += 1
+        if count:
+            self._spawn_rows(count)
+
+    def update(self, dt):
+        """
+        Check if the fleet is at an edge, then update the
+        positions of all aliens in the fleet.
+        """
+        self._spawn_due_rows(dt)
+        if not self.alive.any():
+            return
+        if self._at_edge():
+            self._change_direction()
+        self.x += self.settings.alien_speed * self.settings.fleet_direction * dt
+        self._sync_rects()
+
+    def _at_edge(self):
+        """Return True if any live alien is at the edge of the screen."""
+        left = np.floor(self.x[self.alive])
+        return (left.max() + self.alien_width >= self.settings.screen_width
+            or left.min() <= 0)
+
+    def _change_direction(self):
+        """Drop the entire fleet and change the fleet's direction."""
+        self.y += self.settings.fleet_drop_speed
+        self.settings.fleet_direction *= -1
+
+    def reached_bottom(self):
+        """Return True if any live alien has reached the bottom of the screen."""
+        bottoms = self.y[self.alive] + self.alien_height
+        return bool((bottoms >= self.settings.screen_height).any())
+
+    def _sync_rects(self):
+        """Copy the array positions into the rects of the live aliens."""
+        indices = np.flatnonzero(self.alive)
+        xs = np.floor(self.x[indices]).astype(int).tolist()
+        ys = np.floor(self.y[indices]).astype(int).tolist()
+        sprites = self.sprites
+        for index, x, y in zip(indices.tolist(), xs, ys):
+            sprites[index].rect.topleft = (x, y)
@@ -0,0 +1,79 @@
+import threading
+from collections import OrderedDict
+
+import pygame.font
+
+
+class FontManager:
+    """
+    A class to share fonts and reuse rendered text.
+
+    Each font is looked up once (SysFont scans the system fonts, which is
+    slow, so the default font is opened directly instead). Rendered text
+    surfaces are kept in an LRU cache keyed by text, font and colors, so a
+    score or label shown before isn't rasterized again. Fonts are named by
+    a (name, size, bold) tuple, as passed to SysFont.
+    """
+
+    def __init__(self, ai_game):
+        """Initialize empty font and text caches."""
+        self.settings = ai_game.settings
+        self.fonts = {}
+        # The background loader preloads fonts while the game looks them up,
+        # so only one thread at a time may open a font.
+        self.lock = threading.Lock()
+        self.surfaces = OrderedDict()
+
+        # Text cache statistics.
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, font_key):
+        """Return the font for font_key, looking it up on first use."""
+        font = self.fonts.get(font_key)
+        if font is not None:
+            return font
+        with self.lock:
+            # Another thread may have opened it while this one waited.
+            font = self.fonts.get(font_key)
+            if font is None:
+                name, size, bold = font_key
+                if name is None:
+                    # pygame ships the default font, so there's nothing to look up.
+                    font = pygame.font.Font(None, size)
+                    font.set_bold(bold)
+                else:
+                    font = pygame.font.SysFont(name, size, bold)
+                self.fonts[font_key] = font
+        return font
+
+    def preload(self, font_keys):
+        """Look up the fonts for font_keys ahead of their first use."""
+        for font_key in font_keys:
+            self.font(font_key)
+
+    def render(self, text, font_key, color, background=None):
+        """Return text rendered in font_key's font; don't draw on the result."""
+        key = (text, font_key, color, background)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font(font_key).render(text, True, color, background)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.settings.text_cache_size:
+            # Drop the text that was shown longest ago.
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def stats(self):
+        """Return a summary of the font and text caches."""
+        return {
+            'fonts': len(self.fonts),
+            'texts': len(self.surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -1,6 +1,14 @@
 import pygame
 
 
+# The states a game can be in. Every state but GAME_OVER counts as active;
+# GAME_OVER is also the state before the first game, with the Play button up.
+PLAYING = 'playing'
+RESPAWNING = 'respawning'
+PAUSED = 'paused'
+GAME_OVER = 'game_over'
+
+
 class GameStats:
     """Track statistics for Cat Save Us!"""
 
@@ -10,13 +18,24 @@ class GameStats:
         self.reset_stats()
 
         # Start Cat Save Us! in an inactive state.
-        self.game_active = False
+        self.state = GAME_OVER
+        # (the state to go back to when a paused game continues)
+        self.resume_state = PLAYING
 
         # High score should never be reset.
         self.high_score = 0
 
+    @property
+    def game_active(self):
+        """Return True while a game is being played, paused or respawning."""
+        return self.state != GAME_OVER
+
     def reset_stats(self):
         """Initialize statistics that can change during the game."""
         self.cats_left = self.settings.cat_limit
         self.score = 0
         self.level = 1
+        # (simulated seconds left before play resumes after the cat is hit)
+        self.respawn_time_left = 0.0
+        # (simulated seconds this game has been played, pauses aside)
+        self.play_time = 0.0
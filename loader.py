@@ -0,0 +1,60 @@
+import sys
+import threading
+
+import pygame
+
+
+class BackgroundLoader:
+    """
+    A class to load slow, non-essential assets on a thread while the game runs.
+
+    Each job is a function that's called once, in the order added. A job that
+    fails is reported and skipped, so a missing sound can't stop the game.
+    stop() skips the jobs not yet started and waits for the one running, so
+    pygame can be shut down safely after it.
+    """
+
+    def __init__(self, startup):
+        """Initialize an empty list of jobs, timed by the startup timer."""
+        self.startup = startup
+        self.jobs = []
+        self.errors = {}
+        self.thread = None
+        self.stopping = threading.Event()
+
+    def add(self, name, job):
+        """Add job, a function of no arguments, to run as name."""
+        self.jobs.append((name, job))
+
+    def start(self):
+        """Run the jobs on a background thread."""
+        # A daemon thread can't keep the game from quitting.
+        self.thread = threading.Thread(target=self._run, name='loader', daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        """Run every job, noting the ones that fail."""
+        for name, job in self.jobs:
+            if self.stopping.is_set():
+                return
+            try:
+                with self.startup.phase(name):
+                    job()
+            except (pygame.error, OSError) as e:
+                self.errors[name] = e
+                print("Couldn't load {}: {}".format(name, e), file=sys.stderr)
+
+    @property
+    def done(self):
+        """Return True once every job has run."""
+        return self.thread is None or not self.thread.is_alive()
+
+    def wait(self, timeout=None):
+        """Wait up to timeout seconds for the jobs to finish."""
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def stop(self):
+        """Skip the jobs not yet started, and wait for the running one to finish."""
+        self.stopping.set()
+        self.wait()
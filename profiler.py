@@ -0,0 +1,244 @@
+import cProfile
+import json
+import os
+import time
+from collections import deque
+
+
+class _PhaseTimer:
+    """A reusable context manager that times one phase for a FrameProfiler or StartupTimer."""
+
+    def __init__(self, profiler, name):
+        """Initialize the timer for phase name."""
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.profiler._add(self.name, self.start, time.perf_counter())
+
+
+class StartupTimer:
+    """
+    A class to time the steps of starting the game, up to its first frame.
+
+    The game calls lap() after each step of its setup, and the background
+    loader times its jobs with phase(). report() lists them all, with the
+    time to the first frame.
+    """
+
+    def __init__(self):
+        """Start the clock."""
+        self.start = time.perf_counter()
+        self.last_lap = self.start
+        self.steps = {}
+        self.background = {}
+        self.first_frame = None
+
+    def lap(self, name):
+        """Record the time since the last lap as the step called name."""
+        now = time.perf_counter()
+        self.steps[name] = now - self.last_lap
+        self.last_lap = now
+
+    def phase(self, name):
+        """Return a context manager that times its with block as background job name."""
+        return _PhaseTimer(self, name)
+
+    def _add(self, name, start, end):
+        """Record a timed background job."""
+        self.background[name] = end - start
+
+    def frame_drawn(self):
+        """Note the time of the first frame drawn."""
+        if self.first_frame is None:
+            self.first_frame = time.perf_counter() - self.start
+
+    def report(self):
+        """Return the startup timings as lines of text, in ms."""
+        lines = ["Startup:"]
+        for name, seconds in self.steps.items():
+            lines.append("  {:<18} {:8.1f} ms".format(name, seconds * 1000))
+        if self.first_frame is not None:
+            lines.append("  {:<18} {:8.1f} ms".format('first frame at', self.first_frame * 1000))
+        if self.background:
+            lines.append("Loaded in the background:")
+            for name, seconds in self.background.items():
+                lines.append("  {:<18} {:8.1f} ms".format(name, seconds * 1000))
+        return lines
+
+
+class FrameProfiler:
+    """
+    A class to time the phases of each frame and show them in-game.
+
+    run_game() wraps each phase of a frame in phase(). The profiler keeps
+    rolling per-phase timings, and can draw an overlay with the fps, the
+    phase breakdown, the disk loads so far and the sprite counts. It can
+    also capture a window of frames to a cProfile file, or to a Chrome trace
+    (a .json file for chrome://tracing or Perfetto).
+    """
+
+    def __init__(self, ai_game):
+        """Initialize empty timings, with the overlay hidden."""
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.fonts = ai_game.fonts
+
+        window = self.settings.profile_window
+        self.frame_times = deque(maxlen=window)
+        self.phase_times = {}
+        self.current = {}
+        # One timer per phase, created on first use and reused after.
+        self.timers = {}
+        self.frame = 0
+        self.frame_start = 0.0
+
+        self.show_overlay = False
+        self.overlay_images = []
+        self.font_key = (None, 24, False)
+        self.text_color = (230, 230, 230)
+
+        # The frames to capture, and where to write them.
+        self.capture_start = None
+        self.capture_end = None
+        self.capture_path = None
+        self.profile = None
+        self.trace_events = []
+
+    def capture(self, start, end, path):
+        """Profile frames start to end (inclusive) and write the result to path."""
+        self.capture_start = start
+        self.capture_end = end
+        self.capture_path = path
+
+    @property
+    def capturing(self):
+        """Return True if the current frame is in the capture window."""
+        return (self.capture_path is not None
+            and self.capture_start <= self.frame <= self.capture_end)
+
+    def begin_frame(self):
+        """Start timing a new frame."""
+        self.current = {}
+        self.frame_start = time.perf_counter()
+        if self.capturing and self.profile is None and not self._chrome_trace():
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    def phase(self, name):
+        """Return a context manager that times its with block as part of phase name."""
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = _PhaseTimer(self, name)
+        return timer
+
+    def _add(self, name, start, end):
+        """Add a timed stretch of phase name to the current frame."""
+        self.current[name] = self.current.get(name, 0.0) + end - start
+        if self.capturing and self._chrome_trace():
+            self.trace_events.append({
+                'name': name, 'ph': 'X', 'pid': 0, 'tid': 0,
+                'ts': start * 1e6, 'dur': (end - start) * 1e6,
+                'args': {'frame': self.frame},
+            })
+
+    def end_frame(self):
+        """Store the finished frame's timings."""
+        frame_time = time.perf_counter() - self.frame_start
+        self.frame_times.append(frame_time)
+        for name, seconds in self.current.items():
+            times = self.phase_times.get(name)
+            if times is None:
+                times = self.phase_times[name] = deque(maxlen=self.frame_times.maxlen)
+            times.append(seconds)
+
+        if self.capturing and self.frame == self.capture_end:
+            self.finish_capture()
+        self.frame += 1
+
+        # Refreshing the overlay text a few times a second is plenty.
+        if self.show_overlay and self.frame % self.settings.profile_overlay_interval == 0:
+            self._prep_overlay()
+
+    def _chrome_trace(self):
+        """Return True if the capture is written as a Chrome trace."""
+        return os.path.splitext(self.capture_path)[1] == '.json'
+
+    def finish_capture(self):
+        """Write the frames captured so far to the capture path."""
+        if self.capture_path is None or self.frame < self.capture_start:
+            return
+        if self.profile is not None:
+            self.profile.disable()
+            self.profile.dump_stats(self.capture_path)
+            self.profile = None
+        else:
+            with open(self.capture_path, 'w') as f:
+                json.dump({'traceEvents': self.trace_events}, f)
+            self.trace_events = []
+        self.capture_path = None
+
+    def stats(self):
+        """
+        Return the recent mean time of each phase in ms, the counts of loads
+        and sprites, and the audio figures.
+        """
+        ai_game = self.ai_game
+        frame_count = len(self.frame_times)
+        mean_frame = sum(self.frame_times) / frame_count if frame_count else 0.0
+        return {
+            'fps': ai_game.clock.get_fps(),
+            'frame_ms': mean_frame * 1000,
+            'phases_ms': {name: sum(times) / len(times) * 1000
+                for name, times in self.phase_times.items()},
+            'loads': {
+                'images': ai_game.assets.load_count,
+                'sounds': ai_game.sounds.load_count,
+                'fonts': len(ai_game.fonts.fonts),
+            },
+            'audio': ai_game.audio.stats(ai_game.sounds.sounds),
+            'sprites': {
+                'aliens': len(ai_game.aliens),
+                'bullets': len(ai_game.bullets),
+                'shock_waves': len(ai_game.shock_waves),
+            },
+        }
+
+    def toggle_overlay(self):
+        """Show or hide the performance overlay."""
+        self.show_overlay = not self.show_overlay
+        if self.show_overlay:
+            self._prep_overlay()
+
+    def _prep_overlay(self):
+        """Render the overlay's lines of text from the current stats."""
+        stats = self.stats()
+        lines = ["FPS {:.1f}   frame {:.2f} ms".format(stats['fps'], stats['frame_ms'])]
+        for name, ms in stats['phases_ms'].items():
+            lines.append("{:<18} {:.3f} ms".format(name, ms))
+        lines.append("loads: " + ", ".join(
+            "{} {}".format(name, count) for name, count in stats['loads'].items()))
+        lines.append("sprites: " + ", ".join(
+            "{} {}".format(name, count) for name, count in stats['sprites'].items()))
+        audio = stats['audio']
+        lines.append("audio: {:.1f} ms latency, effects {:.0f} KB".format(
+            audio['latency_ms'], audio['effects_bytes'] / 1024))
+
+        # The numbers change all the time, so these bypass the text cache.
+        font = self.fonts.font(self.font_key)
+        self.overlay_images = [font.render(line, True, self.text_color) for line in lines]
+
+    def draw(self, surface):
+        """Draw the overlay, if it's shown, and return the rects drawn."""
+        if not self.show_overlay:
+            return []
+        rects = []
+        y = 80
+        for image in self.overlay_images:
+            rects.append(surface.blit(image, (10, y)))
+            y += image.get_height()
+        return rects
@@ -0,0 +1,129 @@
+import pygame
+
+
+class RenderBatch:
+    """
+    A class to gather a frame's blits and draw them with one Surface.blits() call.
+
+    Each blit is (image, position), and is drawn in the order it was added.
+    With track_rects, the batch also keeps the screen rect each blit will
+    cover, which the dirty renderer needs; an image is assumed to be the
+    size of its sprite's rect.
+    """
+
+    def __init__(self, surface, track_rects):
+        """Initialize an empty batch that draws to surface."""
+        self.surface = surface
+        self.clip_rect = surface.get_rect()
+        self.track_rects = track_rects
+        self.blits = []
+        self.rects = []
+
+    def add(self, image, rect):
+        """Add a blit of image at rect."""
+        self.blits.append((image, rect))
+        if self.track_rects:
+            self.rects.append(rect.clip(self.clip_rect))
+
+    def add_sprites(self, group):
+        """Add a blit of every sprite in group, at its rect."""
+        sprites = group.sprites()
+        self.blits.extend([(sprite.image, sprite.rect) for sprite in sprites])
+        if self.track_rects:
+            clip_rect = self.clip_rect
+            self.rects.extend([sprite.rect.clip(clip_rect) for sprite in sprites])
+
+    def flush(self):
+        """Draw everything in the batch, empty it, and return the rects covered."""
+        # pygame 2 has no fblits(), but blits() without a return list is
+        # nearly the same: one call into C, and no list of rects built.
+        self.surface.blits(self.blits, doreturn=False)
+        rects = self.rects
+        self.blits = []
+        self.rects = []
+        return rects
+
+
+class FullRenderer:
+    """A class to redraw the whole screen and flip it every frame."""
+
+    def __init__(self, ai_game):
+        """Initialize the renderer and its pixel counters."""
+        self.screen = ai_game.screen
+        self.background = None
+        # A headless game draws offscreen, so there's no display to update.
+        self.offscreen = ai_game.headless
+        # Sprites are drawn in one batch; rects are ignored, so aren't kept.
+        self.batch = RenderBatch(self.screen, track_rects=False)
+
+        # Pixels sent to the display in the last frame, and in total.
+        self.pixels_pushed = 0
+        self.total_pixels = 0
+        self.frames = 0
+
+    def set_background(self, background):
+        """Use background as the image that's drawn under everything else."""
+        self.background = background
+        self.invalidate()
+
+    def invalidate(self):
+        """Redraw the whole screen next frame (always the case here)."""
+
+    def clear(self):
+        """Draw the background over the whole screen."""
+        self.screen.blit(self.background, (0, 0))
+
+    def present(self, rects):
+        """Make the frame visible; rects are ignored since everything is pushed."""
+        if not self.offscreen:
+            pygame.display.flip()
+        self._count(self.screen.get_width() * self.screen.get_height())
+
+    def _count(self, pixels):
+        """Record how many pixels the last frame pushed to the display."""
+        self.pixels_pushed = pixels
+        self.total_pixels += pixels
+        self.frames += 1
+
+
+class DirtyRenderer(FullRenderer):
+    """
+    A class to redraw and push only the parts of the screen that changed.
+
+    Everything drawn in a frame reports the rect it covered. Next frame
+    those rects are cleared back to the cached background, and only the
+    old and new rects are sent to the display.
+    """
+
+    def __init__(self, ai_game):
+        """Initialize the renderer with nothing drawn yet."""
+        super().__init__(ai_game)
+        self.batch = RenderBatch(self.screen, track_rects=True)
+        self.last_rects = []
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Redraw and push the whole screen next frame."""
+        self.full_redraw = True
+
+    def clear(self):
+        """Erase what was drawn last frame by copying the background over it."""
+        if self.full_redraw:
+            self.screen.blit(self.background, (0, 0))
+            return
+        for rect in self.last_rects:
+            self.screen.blit(self.background, rect, rect)
+
+    def present(self, rects):
+        """Push last frame's rects (now cleared) and this frame's rects."""
+        if self.full_redraw:
+            if not self.offscreen:
+                pygame.display.flip()
+            self._count(self.screen.get_width() * self.screen.get_height())
+            self.full_redraw = False
+        else:
+            dirty = self.last_rects + rects
+            if not self.offscreen:
+                pygame.display.update(dirty)
+            self._count(sum(rect.width * rect.height for rect in dirty))
+        self.last_rects = rects
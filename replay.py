@@ -0,0 +1,160 @@
+import struct
+
+from actions import ALL_ACTIONS
+
+
+# A session log starts with a header: magic, version, RNG seed, the
+# simulation rate and the name of the stress profile the game's settings
+# came from. Then come records, each starting with a 16-bit count:
+# a count above zero is a run of that many steps with the same input (one
+# bit per action), and a count of zero is followed by a checkpoint of the
+# step number, score and level.
+MAGIC = b'CSUR'
+VERSION = 2
+HEADER = struct.Struct('<4sBQH')
+NAME_LENGTH = struct.Struct('<B')
+COUNT = struct.Struct('<H')
+INPUT = struct.Struct('<B')
+CHECKPOINT = struct.Struct('<IQH')
+
+MAX_RUN = 0xFFFF
+ACTION_BITS = {action: 1 << bit for bit, action in enumerate(ALL_ACTIONS)}
+
+
+def encode_actions(actions):
+    """Return the bitmask for a collection of actions."""
+    mask = 0
+    for action in actions:
+        mask |= ACTION_BITS[action]
+    return mask
+
+
+def decode_actions(mask):
+    """Return the frozenset of actions in a bitmask."""
+    return frozenset(action for action, bit in ACTION_BITS.items() if mask & bit)
+
+
+class Recorder:
+    """A class to write a game's per-step input to a compact binary log."""
+
+    def __init__(self, path, seed, sim_rate, profile):
+        """Open path and write the log's header."""
+        name = profile.encode('utf-8')
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, sim_rate)
+            + NAME_LENGTH.pack(len(name)) + name)
+
+        # The run of identical inputs that hasn't been written yet.
+        self.run_mask = 0
+        self.run_length = 0
+
+    def record(self, actions):
+        """Record one simulation step's input."""
+        mask = encode_actions(actions)
+        if mask != self.run_mask or self.run_length == MAX_RUN:
+            self._write_run()
+            self.run_mask = mask
+        self.run_length += 1
+
+    def checkpoint(self, frame, score, level):
+        """Record the score and level after a step, for replays to check."""
+        self._write_run()
+        self.file.write(COUNT.pack(0) + CHECKPOINT.pack(frame, score, level))
+
+    def _write_run(self):
+        """Write out the current run of inputs, if there is one."""
+        if self.run_length:
+            self.file.write(COUNT.pack(self.run_length) + INPUT.pack(self.run_mask))
+        self.run_length = 0
+
+    def close(self):
+        """Write out anything left and close the log."""
+        self._write_run()
+        self.file.close()
+
+
+class SessionLog:
+    """A class to hold a recorded session: its seed, settings, inputs and checkpoints."""
+
+    def __init__(self, seed, sim_rate, profile, inputs, checkpoints, truncated=False):
+        """Store the parts of a session log."""
+        self.seed = seed
+        self.sim_rate = sim_rate
+        self.profile = profile
+        # One frozenset of actions per simulation step.
+        self.inputs = inputs
+        # (step, score, level) tuples, in the order they were recorded.
+        self.checkpoints = checkpoints
+        # (True if the log was cut short, so its last checkpoint is missing)
+        self.truncated = truncated
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read the session log at path.
+
+        A log cut short, say by the game being killed, is read up to its
+        last complete record.
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        if len(data) < HEADER.size + NAME_LENGTH.size:
+            raise ValueError("{} is too short to be a session log".format(path))
+        magic, version, seed, sim_rate = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("{} is not a Cat Save Us! session log".format(path))
+
+        offset = HEADER.size
+        (name_length,) = NAME_LENGTH.unpack_from(data, offset)
+        offset += NAME_LENGTH.size
+        if offset + name_length > len(data):
+            raise ValueError("{} is too short to be a session log".format(path))
+        profile = data[offset:offset + name_length].decode('utf-8')
+        offset += name_length
+
+        inputs = []
+        checkpoints = []
+        truncated = False
+        while offset + COUNT.size <= len(data):
+            (count,) = COUNT.unpack_from(data, offset)
+            record = INPUT if count else CHECKPOINT
+            if offset + COUNT.size + record.size > len(data):
+                truncated = True
+                break
+            offset += COUNT.size
+            if count:
+                (mask,) = record.unpack_from(data, offset)
+                inputs.extend([decode_actions(mask)] * count)
+            else:
+                checkpoints.append(record.unpack_from(data, offset))
+            offset += record.size
+        truncated = truncated or offset < len(data)
+        return cls(seed, sim_rate, profile, inputs, checkpoints, truncated)
+
+
+def replay(path):
+    """
+    Replay the session log at path headless, as fast as possible.
+
+    Return (recorded checkpoints, replayed checkpoints); a faithful replay
+    gives two equal lists.
+    """
+    # Imported here, since the game itself imports this module.
+    from cat_save_us import CatSaveUs
+    from settings import Settings
+
+    log = SessionLog.load(path)
+    settings = Settings()
+    settings.apply_profile(log.profile)
+    ai_game = CatSaveUs(headless=True, seed=log.seed, settings=settings)
+    if ai_game.settings.sim_rate != log.sim_rate:
+        raise ValueError("the log was recorded at {} steps per second, not {}".format(
+            log.sim_rate, ai_game.settings.sim_rate))
+
+    ai_game.step(len(log.inputs), log.inputs)
+    if log.truncated:
+        # The game never got to write its final checkpoint.
+        return log.checkpoints, ai_game.checkpoints[:len(log.checkpoints)]
+    ai_game.checkpoint()
+    return log.checkpoints, ai_game.checkpoints
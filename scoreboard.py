@@ -14,6 +14,7 @@ class Scoreboard:
         self.screen_rect = self.screen.get_rect()
         self.settings = ai_game.settings
         self.stats = ai_game.stats
+        self.scores = ai_game.scores
 
         # We give __init__() the ai_game parameter here so that it can access
         # the settings, screen, and stats objects, which it will need to report
@@ -21,7 +22,8 @@ class Scoreboard:
 
         # Font settings for scoring information.
         self.text_color = (0, 200, 100)
-        self.font = pygame.font.SysFont(None, 48)
+        self.fonts = ai_game.fonts
+        self.font_key = (None, 48, False)
 
         # Prepare the initial score images.
         self.prep_score()
@@ -34,7 +36,8 @@ class Scoreboard:
         rounded_score = round(self.stats.score, -1)
         # ^^ The above rounds the score to multiples of 10
         score_str = "{:,}".format(rounded_score)
-        self.score_image = self.font.render(score_str, True, self.text_color, self.settings.bg_color)
+        self.score_image = self.fonts.render(score_str, self.font_key, self.text_color,
+            self.settings.bg_color)
 
         # Display the score at the top right of the screen.
         self.score_rect = self.score_image.get_rect()
@@ -46,47 +49,38 @@ class Scoreboard:
         # from the top of the screen.
 
     def prep_high_score(self):
-        """Turn the high score into a rendered image."""
-        high_score = round(self.stats.high_score, -1)
-
-        f = open('high_score.txt', 'r')
-        file = f.readlines()
-        all_time_high_score = int(file[0])
-
-        high_score_str = "High Score: {:,}".format(all_time_high_score)
-        self.high_score_image = self.font.render(high_score_str, True, self.text_color, self.settings.bg_color)
+        """Turn the all-time high score into a rendered image."""
+        # Like the score, it's shown rounded, but kept exactly.
+        high_score_str = "High Score: {:,}".format(round(self.scores.value, -1))
+        self.high_score_image = self.fonts.render(high_score_str, self.font_key, self.text_color,
+            self.settings.bg_color)
 
         # Center the all-time high score at the top of the screen.
         self.high_score_rect = self.high_score_image.get_rect()
         self.high_score_rect.centerx = self.screen_rect.centerx
         self.high_score_rect.top = self.score_rect.top
 
-        if all_time_high_score < int(high_score):
-            f.close()
-            file = open('high_score.txt', 'w')
-            file.write(str(high_score))
-            file.close()
-            return high_score
-        return all_time_high_score
-
-    def show_score(self):
-        """Draw scores, level, and cats to the screen."""
-        self.screen.blit(self.score_image, self.score_rect)
-        self.screen.blit(self.high_score_image, self.high_score_rect)
-        self.screen.blit(self.level_image, self.level_rect)
-        self.cats.draw(self.screen)
+    def show_score(self, batch):
+        """Add the scores, level, and cats to a frame's render batch."""
+        batch.add(self.score_image, self.score_rect)
+        batch.add(self.high_score_image, self.high_score_rect)
+        batch.add(self.level_image, self.level_rect)
+        batch.add_sprites(self.cats)
 
     def check_high_score(self):
         """Check to see if there's a new high score."""
         if self.stats.score > self.stats.high_score:
             self.stats.high_score = self.stats.score
-            self.prep_high_score()
+            # The image only needs re-rendering when the all-time high score changes.
+            if self.scores.submit(self.stats.high_score):
+                self.prep_high_score()
 
     def prep_level(self):
         """Turn the level into a rendered image."""
         level_str = str(self.stats.level)
         current_level = "Level: {}".format(level_str)
-        self.level_image = self.font.render(current_level, True, self.text_color, self.settings.bg_color)
+        self.level_image = self.fonts.render(current_level, self.font_key, self.text_color,
+            self.settings.bg_color)
 
         # Position the level below the score.
         self.level_rect = self.level_image.get_rect()
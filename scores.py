@@ -0,0 +1,225 @@
+"""
+A database of every run of the game, kept in SQLite.
+
+The database is opened in WAL mode, so any number of games (a batch of
+headless runs, say) can add runs to it at once while others read it.
+Run this file to see the best runs:
+
+    python3 scores.py --top 10
+"""
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+from settings import Settings
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    level INTEGER,
+    duration REAL,
+    seed INTEGER,
+    profile TEXT,
+    overrides TEXT,
+    recorded_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score);
+"""
+
+RUN_COLUMNS = ('score', 'level', 'duration', 'seed', 'profile', 'overrides', 'recorded_at')
+
+# The database a game played in its window saves its runs in.
+DEFAULT_DATABASE = 'scores.db'
+
+
+def connect(path):
+    """Open the database at path, creating its tables if they're missing."""
+    # Transactions are begun explicitly; timeout is how long to wait for
+    # another game's write to finish before giving up.
+    connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+    connection.execute('PRAGMA journal_mode=WAL')
+    # In WAL mode this is still safe against a crash of the game.
+    connection.execute('PRAGMA synchronous=NORMAL')
+    connection.executescript(SCHEMA)
+    # A database made before runs kept their overrides gets the column now.
+    columns = [row[1] for row in connection.execute('PRAGMA table_info(runs)')]
+    if 'overrides' not in columns:
+        try:
+            connection.execute('ALTER TABLE runs ADD COLUMN overrides TEXT')
+        except sqlite3.OperationalError:
+            # (another game added it first)
+            pass
+    return connection
+
+
+class ScoreStore:
+    """
+    A class to record runs in the score database and keep the high score.
+
+    The high score is read once, then kept in memory. Finished runs are
+    queued, and a writer thread adds everything queued to the database in
+    one transaction, so a frame never waits on the disk. A game played in
+    its window uses DEFAULT_DATABASE unless the settings name another; a
+    headless game (a bot, a test or a benchmark) keeps no runs unless they do.
+    """
+
+    def __init__(self, ai_game):
+        """Open the database, bring in an old high score file, and read the high score."""
+        self.settings = ai_game.settings
+        self.path = self.settings.score_database
+        if self.path is None and not ai_game.headless:
+            self.path = DEFAULT_DATABASE
+        self.value = 0
+        self.queue = queue.Queue()
+        self.writer = None
+        self.connection = None
+        if self.path is None:
+            return
+
+        self.connection = connect(self.path)
+        if not ai_game.headless:
+            # Only the player's own games bring in the player's old high score.
+            self._migrate(self.settings.legacy_high_score_file)
+        self.value = self._best_score()
+
+        # A daemon thread can't keep the game from quitting; close() waits for it.
+        self.writer = threading.Thread(target=self._write_runs, name='score writer',
+            daemon=True)
+        self.writer.start()
+
+    def _migrate(self, legacy_path):
+        """Record the high score from an old high score file, if the database is new."""
+        if legacy_path is None:
+            return
+        try:
+            with open(legacy_path) as f:
+                score = int(f.readline().strip() or 0)
+        except (OSError, ValueError):
+            return
+        if not score:
+            return
+        # Take the write lock first, so two games starting at once can't
+        # both find the database empty.
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            if self.connection.execute('SELECT 1 FROM runs LIMIT 1').fetchone() is None:
+                self.connection.execute(
+                    'INSERT INTO runs (score, profile) VALUES (?, ?)',
+                    (score, os.path.basename(legacy_path)))
+        except sqlite3.Error:
+            self.connection.execute('ROLLBACK')
+            raise
+        self.connection.execute('COMMIT')
+
+    def _best_score(self):
+        """Return the best score in the database, or 0 if it's empty."""
+        row = self.connection.execute('SELECT MAX(score) FROM runs').fetchone()
+        return row[0] or 0
+
+    def submit(self, score):
+        """Record score if it beats the high score; return True if it did."""
+        if score <= self.value:
+            return False
+        self.value = score
+        return True
+
+    def record_run(self, score, level, duration, seed, profile, overrides=None):
+        """Queue a finished run, and the settings it overrode, to be added to the database."""
+        if self.writer is not None:
+            # The overrides are kept as JSON, so sweeps can be told apart.
+            overrides = json.dumps(overrides, sort_keys=True) if overrides else None
+            self.queue.put((score, level, duration, seed, profile, overrides))
+
+    def _write_runs(self):
+        """Add queued runs to the database in batches, until close() is called."""
+        connection = connect(self.path)
+        delay = self.settings.score_write_delay
+        stopping = False
+        while not stopping:
+            runs = [self.queue.get()]
+            # Gather whatever else arrives shortly after, for the same transaction.
+            deadline = time.monotonic() + delay
+            while runs[-1] is not None:
+                try:
+                    runs.append(self.queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            if runs[-1] is None:
+                stopping = True
+                runs.pop()
+
+            if runs:
+                try:
+                    connection.execute('BEGIN')
+                    connection.executemany(
+                        'INSERT INTO runs (score, level, duration, seed, profile, overrides)'
+                        ' VALUES (?, ?, ?, ?, ?, ?)', runs)
+                    connection.execute('COMMIT')
+                except sqlite3.Error as e:
+                    if connection.in_transaction:
+                        connection.execute('ROLLBACK')
+                    print("Couldn't save {} runs: {}".format(len(runs), e), file=sys.stderr)
+        connection.close()
+
+    def close(self):
+        """Write the runs still queued, and close the database."""
+        if self.writer is None:
+            return
+        self.queue.put(None)
+        self.writer.join()
+        self.writer = None
+        self.connection.close()
+
+    def top(self, count=10):
+        """Return the count best runs saved so far, best first, as dicts."""
+        if self.connection is None:
+            return []
+        rows = self.connection.execute(
+            'SELECT {} FROM runs ORDER BY score DESC LIMIT ?'.format(', '.join(RUN_COLUMNS)),
+            (count,))
+        runs = [dict(zip(RUN_COLUMNS, row)) for row in rows]
+        for run in runs:
+            run['overrides'] = json.loads(run['overrides']) if run['overrides'] else {}
+        return runs
+
+
+class _ScoreGame:
+    """The parts of a game that a ScoreStore needs, for reading the database."""
+
+    def __init__(self, path):
+        self.settings = Settings()
+        self.settings.score_database = path
+        # Reading the scores shouldn't bring in an old high score file.
+        self.headless = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cat Save Us! best runs")
+    parser.add_argument('--top', type=int, default=10, help="how many runs (default: 10)")
+    parser.add_argument('--database', default=DEFAULT_DATABASE, metavar='PATH',
+        help="score database (default: {})".format(DEFAULT_DATABASE))
+    args = parser.parse_args()
+
+    scores = ScoreStore(_ScoreGame(args.database))
+    print("{:>4} {:>12} {:>6} {:>9} {:>11} {:<10} {:<19} {}".format(
+        'rank', 'score', 'level', 'minutes', 'seed', 'profile', 'recorded', 'overrides'))
+    for rank, run in enumerate(scores.top(args.top), 1):
+        print("{:>4} {:>12,} {:>6} {:>9} {:>11} {:<10} {:<19} {}".format(
+            rank, run['score'], run['level'] or '',
+            '' if run['duration'] is None else '{:.1f}'.format(run['duration'] / 60),
+            '' if run['seed'] is None else run['seed'], run['profile'] or '',
+            run['recorded_at'],
+            ', '.join('{}={!r}'.format(name, value)
+                for name, value in run['overrides'].items())))
+    scores.close()
+
+
+if __name__ == '__main__':
+    main()
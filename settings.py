@@ -1,5 +1,49 @@
 import pygame
 
+
+# Named groups of settings for load testing; apply one with apply_profile().
+STRESS_PROFILES = {
+    'default': {},
+    # A denser fleet and more projectiles on the usual screen.
+    'dense': {
+        'fleet_spacing': 0.25,
+        'bullets_allowed': 100,
+        'shock_waves_allowed': 3,
+        'auto_fire_rate': 20,
+    },
+    # Twice the screen size: about 10x the aliens, and hundreds of bullets.
+    'large': {
+        'screen_width': 2700,
+        'screen_height': 1600,
+        'fleet_spacing': 0.5,
+        'bullets_allowed': 300,
+        'shock_waves_allowed': 5,
+        'auto_fire_rate': 60,
+    },
+    # Three times the screen size, packed tight, with a firehose of bullets.
+    'extreme': {
+        'screen_width': 4050,
+        'screen_height': 2400,
+        'fleet_spacing': 0.25,
+        'bullets_allowed': 1000,
+        'shock_waves_allowed': 10,
+        'auto_fire_rate': 240,
+    },
+}
+
+# Mixer formats. The buffer holds buffer / frequency seconds of sound, which
+# is how long an effect waits before it's heard; decoded effects take up
+# frequency * (bits / 8) * channels bytes per second.
+AUDIO_PROFILES = {
+    # pygame's own defaults.
+    'balanced': {'frequency': 44100, 'size': -16, 'channels': 2, 'buffer': 512},
+    # Half the buffer: effects are heard sooner, but a slow machine may crackle.
+    'low_latency': {'frequency': 44100, 'size': -16, 'channels': 2, 'buffer': 256},
+    # Mono at half the rate: effects take a quarter of the memory.
+    'low_memory': {'frequency': 22050, 'size': -16, 'channels': 1, 'buffer': 512},
+}
+
+
 class Settings:
     """A class to store all settings for "Cat Save Us!" game."""
 
@@ -14,8 +58,42 @@ class Settings:
         self.bg_color = (0, 0, 0)
         # self.bg_color = (104, 130, 158) (greyish blue, aka "Daytime Mode")
 
+        # Frame rate settings
+        # The game logic advances in fixed steps of 1 / sim_rate seconds, no
+        # matter how often the screen is redrawn. fps_cap limits how many frames
+        # are drawn per second (0 means uncapped). With fixed_timestep set to
+        # False, the logic advances once per frame by that frame's length.
+        self.fixed_timestep = True
+        self.sim_rate = 60
+        self.fps_cap = 60
+        # (a frame longer than this is clamped, so a stall can't snowball)
+        self.max_frame_time = 0.25
+
+        # Rendering settings
+        # (redraw and push only the parts of the screen that changed)
+        self.dirty_rect_rendering = False
+        # (how many rendered text images are kept for reuse)
+        self.text_cache_size = 256
+
+        # Profiler settings
+        # (frames the phase timings are averaged over, and how many frames
+        # pass between refreshes of the performance overlay, shown with F3)
+        self.profile_window = 120
+        self.profile_overlay_interval = 15
+
+        # Random seed for the game (the starry sky is its only random part);
+        # None picks a new one every run.
+        self.seed = None
+
+        # Starry sky settings
+        # (draw the stars on this many scrolling layers; 0 keeps them still)
+        self.starfield_parallax_layers = 0
+        self.starfield_scroll_speed = 20
+
         # Cat settings
         self.cat_limit = 3
+        # (simulated seconds the game waits after the cat is hit)
+        self.respawn_delay = 1.0
 
         # Bullet settings
         self.bullet_width = 8
@@ -29,8 +107,36 @@ class Settings:
         self.shock_wave_color = (255, 0, 0)
         self.shock_waves_allowed = 1
 
+        # Score settings
+        # (every run is saved in this SQLite database; None means scores.db
+        # for a game played in its window, and no database for a headless one)
+        self.score_database = None
+        # (an old high score file, brought into the player's new database)
+        self.legacy_high_score_file = 'high_score.txt'
+        # (runs that finish within this many seconds are saved together)
+        self.score_write_delay = 0.5
+
+        # Sound settings
+        # (the number of mixer channels reserved for sound effects)
+        self.sound_channels = 8
+        # (the mixer format, from AUDIO_PROFILES)
+        self.audio_profile = 'balanced'
+
         # Alien settings
         self.fleet_drop_speed = 10
+        # (the gap between aliens, in alien widths and heights)
+        self.fleet_spacing = 1.0
+        # (None fits as many columns or rows as the screen has room for)
+        self.fleet_columns = None
+        self.fleet_rows = None
+        # (seconds between the rows of a new fleet entering; 0 for all at once)
+        self.fleet_spawn_interval = 0.05
+
+        # Load testing settings
+        # (the stress profile these settings came from)
+        self.profile = 'default'
+        # (bullets fired automatically per second while playing; 0 is off)
+        self.auto_fire_rate = 0
 
         # How quickly the game speeds up
         self.speedup_scale = 1.15
@@ -38,15 +144,41 @@ class Settings:
         # How quickly the alien point values increase
         self.score_scale = 1.5
 
+        # (settings changed with override(), kept through every new game)
+        self.overrides = {}
+
         self.initialize_dynamic_settings()
 
+    def apply_profile(self, name):
+        """Change the settings to the stress profile called name."""
+        if name not in STRESS_PROFILES:
+            raise ValueError("unknown stress profile {!r} (choose from {})".format(
+                name, ', '.join(STRESS_PROFILES)))
+        for setting, value in STRESS_PROFILES[name].items():
+            setattr(self, setting, value)
+        self.profile = name
+
+    def override(self, overrides):
+        """
+        Change settings from a dict of {setting: value}.
+
+        Overridden dynamic settings become their new starting values, so a
+        new game doesn't reset them.
+        """
+        for setting, value in overrides.items():
+            if not hasattr(self, setting):
+                raise ValueError("unknown setting {!r}".format(setting))
+            setattr(self, setting, value)
+        self.overrides.update(overrides)
+
     def initialize_dynamic_settings(self):
         """Initialize settings that change throughout the game."""
-        self.cat_speed = 5
+        # Speeds are in pixels per second.
+        self.cat_speed = 300
         # (the higher the number, the faster the cat)
-        self.bullet_speed = 5.0
-        self.shock_wave_speed = 1.5
-        self.alien_speed = 2
+        self.bullet_speed = 300.0
+        self.shock_wave_speed = 90.0
+        self.alien_speed = 120
 
         # fleet_direction of 1 represents right; -1 represents left.
         self.fleet_direction = 1
@@ -54,6 +186,9 @@ class Settings:
         # Scoring
         self.alien_points = 50
 
+        for setting, value in self.overrides.items():
+            setattr(self, setting, value)
+
     def increase_speed(self):
         """Increase speed settings and alien point values."""
         self.cat_speed *= self.speedup_scale
@@ -0,0 +1,89 @@
+import time
+
+import pygame
+
+
+# Each effect: (file, volume, minimum milliseconds between two plays).
+EFFECTS = {
+    'bullet': ('sounds/CatBullet.wav', 0.5, 40),
+    'shock_wave': ('sounds/EmitShockwave.wav', 0.5, 100),
+    'alien_hit': ('sounds/AlienShipCrash.wav', 0.3, 60),
+    'shock_wave_hit': ('sounds/ShockWaveHit.wav', 0.4, 120),
+    'cat_hit': ('sounds/CatHit.wav', 1.0, 0),
+    'game_over': ('sounds/GameOver.wav', 1.0, 0),
+    'last_cat': ('sounds/CatMeow.wav', 1.0, 0),
+}
+
+
+class SoundBank:
+    """A class to decode the sound effects once and play them on a channel pool."""
+
+    def __init__(self, ai_game):
+        """Initialize an empty bank; it stays silent until load() is called."""
+        self.settings = ai_game.settings
+        self.sounds = {}
+        self.min_intervals = {}
+        self.last_played = {}
+        self.channels = []
+        self.next_channel = 0
+
+        # Play counts, including the plays that were skipped by rate limiting.
+        self.load_count = 0
+        self.play_count = 0
+        self.skip_count = 0
+
+    def load(self):
+        """Load every effect and reserve the mixer channels used to play them."""
+        # Without a working audio device the bank stays silent.
+        if not pygame.mixer.get_init():
+            return
+
+        # This may run on a loading thread while the game plays, so the
+        # effects only become playable once everything is ready.
+        sounds = {}
+        for name, (path, volume, min_interval) in EFFECTS.items():
+            sound = pygame.mixer.Sound(path)
+            sound.set_volume(volume)
+            sounds[name] = sound
+            self.min_intervals[name] = min_interval
+            self.load_count += 1
+
+        # Reserve a fixed pool of channels for effects, so a burst of hits
+        # can't take over the channels pygame hands out automatically.
+        pool_size = self.settings.sound_channels
+        if pygame.mixer.get_num_channels() < pool_size:
+            pygame.mixer.set_num_channels(pool_size)
+        pygame.mixer.set_reserved(pool_size)
+        self.channels = [pygame.mixer.Channel(i) for i in range(pool_size)]
+        self.sounds = sounds
+
+    def play(self, name):
+        """Play the effect called name, unless it was played too recently."""
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+
+        # (pygame's own clock only runs if every module was initialized)
+        now = time.monotonic() * 1000
+        last = self.last_played.get(name)
+        if last is not None and now - last < self.min_intervals[name]:
+            self.skip_count += 1
+            return
+        self.last_played[name] = now
+
+        self._get_channel().play(sound)
+        self.play_count += 1
+
+    def _get_channel(self):
+        """Return an idle channel from the pool, or the oldest busy one."""
+        pool_size = len(self.channels)
+        for offset in range(pool_size):
+            channel = self.channels[(self.next_channel + offset) % pool_size]
+            if not channel.get_busy():
+                break
+        else:
+            # Every channel is busy: cut off the one started longest ago.
+            offset = 0
+            channel = self.channels[self.next_channel]
+        self.next_channel = (self.next_channel + offset + 1) % pool_size
+        return channel
@@ -0,0 +1,94 @@
+import random
+
+import pygame
+
+
+class Starfield:
+    """A class to bake the starry night sky into background images."""
+
+    def __init__(self, ai_game):
+        """Lay out the stars and render the sky."""
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+        self.star_image = ai_game.atlas.image('star')
+
+        self.seed = None
+        self.size = None
+        self.background = None
+        self.layers = []
+        self.offsets = []
+        self.rebuild(ai_game.seed)
+
+    @property
+    def scrolling(self):
+        """Return True if the sky is drawn as moving parallax layers."""
+        return bool(self.layers)
+
+    def rebuild(self, seed=None):
+        """Render the sky again if the seed or the screen size has changed."""
+        size = self.screen.get_size()
+        if self.background is not None and seed == self.seed and size == self.size:
+            return
+        self.seed = seed
+        self.size = size
+
+        positions = self._lay_out_stars(random.Random(seed))
+
+        # The background always holds the background color. Without parallax
+        # the stars are baked right into it, so a frame only needs one blit.
+        self.background = pygame.Surface(size).convert()
+        self.background.fill(self.settings.bg_color)
+
+        layer_count = self.settings.starfield_parallax_layers
+        if not layer_count:
+            self.layers = []
+            self.offsets = []
+            self.background.blits([(self.star_image, pos) for pos in positions],
+                doreturn=False)
+            return
+
+        # With parallax, every star goes on one of a few transparent layers.
+        self.layers = [pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+            for _ in range(layer_count)]
+        for layer in self.layers:
+            layer.fill((0, 0, 0, 0))
+        for star_number, pos in enumerate(positions):
+            self.layers[star_number % layer_count].blit(self.star_image, pos)
+        self.offsets = [0.0] * layer_count
+
+    def _lay_out_stars(self, rng):
+        """Return the top-left corner of every star in the sky."""
+        star_width, star_height = self.star_image.get_size()
+        screen_width, screen_height = self.size
+
+        # Fill the screen with a grid of stars, each one nudged at random.
+        number_stars_x = (screen_width - star_width) // star_width
+        star_number_rows = (screen_height - star_height) // star_height
+
+        positions = []
+        for star_row_number in range(star_number_rows):
+            for star_number in range(number_stars_x):
+                random_range = rng.randint(-10, 10)
+                random_number = rng.randint(1, 10)
+                x = random_range + random_number * star_width * star_number
+                y = random_range + random_number * star_height * star_row_number
+                # Most of the nudged stars land off the screen; skip those.
+                if x < screen_width and y < screen_height:
+                    positions.append((x, y))
+        return positions
+
+    def update(self, dt):
+        """Scroll the parallax layers down, the nearer ones faster."""
+        height = self.size[1]
+        for layer_number in range(len(self.offsets)):
+            speed = self.settings.starfield_scroll_speed * (layer_number + 1)
+            self.offsets[layer_number] = (self.offsets[layer_number] + speed * dt) % height
+
+    def draw(self, surface):
+        """Draw the parallax layers, wrapping each one around the screen."""
+        height = self.size[1]
+        blits = []
+        for layer, offset in zip(self.layers, self.offsets):
+            blits.append((layer, (0, int(offset))))
+            blits.append((layer, (0, int(offset) - height)))
+        surface.blits(blits, doreturn=False)